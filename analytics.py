@@ -0,0 +1,128 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, func, select, text
+
+from models import db, Contract, ContractSummary
+from money import money_json
+
+EXPIRING_WINDOWS = [30, 60, 90]
+
+def _add_sql(prefix: str) -> str:
+    return f"""INSERT INTO contract_summary (status, expiration_day, contract_count, total_value)
+        VALUES ({prefix}.status, COALESCE({prefix}.expiration_date, ''), 1, {prefix}.value)
+        ON CONFLICT (status, expiration_day) DO UPDATE SET
+            contract_count = contract_count + 1,
+            total_value = total_value + excluded.total_value;"""
+
+def _remove_sql(prefix: str) -> str:
+    key = f"status = {prefix}.status AND expiration_day = COALESCE({prefix}.expiration_date, '')"
+    return f"""UPDATE contract_summary SET
+            contract_count = contract_count - 1,
+            total_value = total_value - {prefix}.value
+        WHERE {key};
+        DELETE FROM contract_summary WHERE {key} AND contract_count <= 0;"""
+
+# Like the data version triggers, these run inside the writing transaction, so
+# the summary stays consistent with every path that changes contracts
+SUMMARY_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS contract_summary_ai AFTER INSERT ON contract BEGIN
+        {_add_sql('new')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contract_summary_ad AFTER DELETE ON contract BEGIN
+        {_remove_sql('old')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contract_summary_au AFTER UPDATE OF status, expiration_date, value ON contract BEGIN
+        {_remove_sql('old')}
+        {_add_sql('new')}
+    END""",
+]
+
+SUMMARY_TRIGGERS = ['contract_summary_ai', 'contract_summary_ad', 'contract_summary_au']
+
+def create_summary_triggers(connection) -> None:
+    """Create the contract triggers that maintain contract_summary."""
+    for statement in SUMMARY_DDL:
+        connection.execute(text(statement))
+
+def drop_summary_triggers(connection) -> None:
+    """Drop the contract triggers that maintain contract_summary, if present."""
+    for name in SUMMARY_TRIGGERS:
+        connection.execute(text(f'DROP TRIGGER IF EXISTS {name}'))
+
+def rebuild_summary(connection) -> int:
+    """
+    Recompute contract_summary from a full scan of the contract table.
+
+    Only needed to recover from a summary that was edited by hand or from a
+    database where the triggers were missing.
+
+    Returns:
+        int: Number of summary rows written
+    """
+    connection.execute(text('DELETE FROM contract_summary'))
+    result = connection.execute(text(
+        """INSERT INTO contract_summary (status, expiration_day, contract_count, total_value)
+           SELECT status, COALESCE(expiration_date, ''), COUNT(*), SUM(value)
+           FROM contract GROUP BY status, COALESCE(expiration_date, '')"""
+    ))
+    return result.rowcount
+
+def get_summary(today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Dashboard figures read from contract_summary rather than the contract table.
+
+    Values are summed as integer cents, so totals are exact to the cent.
+
+    Args:
+        today (date): Reference date for the expiring windows (default: today)
+
+    Returns:
+        Dict[str, Any]: Totals by status, contracts expiring within each of
+        EXPIRING_WINDOWS days, and contracts by expiration month
+    """
+    today = today or date.today()
+    count = func.sum(ContractSummary.contract_count)
+    total = func.coalesce(func.sum(ContractSummary.total_value), 0)
+
+    status_totals = db.session.execute(
+        select(ContractSummary.status, count, total)
+        .group_by(ContractSummary.status).order_by(ContractSummary.status)
+    ).all()
+    by_status = [
+        {'status': status, 'count': int(n), 'total_value': money_json(value)}
+        for status, n, value in status_totals
+    ]
+
+    expiring = []
+    for days in EXPIRING_WINDOWS:
+        n, value = db.session.execute(
+            select(count, total).where(ContractSummary.expiration_day.between(
+                today.isoformat(), (today + timedelta(days=days)).isoformat()
+            ))
+        ).one()
+        expiring.append({'days': days, 'count': int(n or 0), 'total_value': money_json(value)})
+
+    month = func.substr(ContractSummary.expiration_day, 1, 7)
+    by_month = [
+        {'month': m, 'count': int(n), 'total_value': money_json(value)}
+        for m, n, value in db.session.execute(
+            select(month, count, total)
+            .where(ContractSummary.expiration_day != '')
+            .group_by(month).order_by(month)
+        )
+    ]
+
+    return {
+        'as_of': today.isoformat(),
+        'total_count': sum(row['count'] for row in by_status),
+        'total_value': money_json(sum((value for _, _, value in status_totals), Decimal('0.00'))),
+        'by_status': by_status,
+        'expiring': expiring,
+        'by_expiration_month': by_month,
+    }
+
+@event.listens_for(Contract.__table__, 'after_create')
+def _create_triggers_after_contract(target, connection, **kw):
+    create_summary_triggers(connection)
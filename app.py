@@ -1,10 +1,33 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
+from flask import (Flask, Response, current_app, get_flashed_messages, render_template, request, redirect, url_for,
+                   flash, jsonify, send_file, stream_template, stream_with_context)
+from flask.cli import with_appcontext
 from datetime import datetime
+from decimal import Decimal
+import csv
+import io
 import os
+import click
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Mapping, Tuple
+from sqlalchemy import func, select
 from models import db, Contract
-from pdf_operations import extract_pdf_data, generate_pdf_report
+from money import money_json, parse_money
+from contract_import import import_contracts_csv
+from contract_export import (EXPORT_FIELDS, contract_columns, csv_chunks, gzip_chunks, iter_rows,
+                             json_array_chunks, ndjson_lines, parse_fields)
+from pagination import Page, keyset_paginate
+from search_index import fts_search_filters, ranked_fts_matches
+from migrations import check_query_plans, upgrade
+from report_jobs import DONE, ReportJobManager, normalize_report_params
+from report_cache import ReportCache
+from report_prerender import prerender_reports, watch_reports
+from data_version import get_data_stamp
+from analytics import get_summary, rebuild_summary
+from change_log import CHANGES_PER_PAGE, MAX_CHANGES_PER_PAGE, get_changes, latest_change_id
+from metrics import Metrics
+from storage import Storage
+from conditional import conditional_get
+from search_cache import ContractRow, SearchCache
 
 # Configure logging
 logging.basicConfig(
@@ -13,33 +36,276 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'your-secret-key'  # Used for flash messages and session security
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///contracts.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Extensions are bound to an app by create_app(); the caches and the report job pool
+# hold per-app state, so create_app() builds them and views find them in app.extensions
+storage = Storage()  # initialises db with the SQLite pool and pragma settings
+metrics = Metrics()
 
-db.init_app(app)
+# (rule, view, options) registered on the app by create_app(); endpoints keep the view names
+ROUTES: List[tuple] = []
+COMMANDS: List[click.Command] = []
 
-with app.app_context():
-    db.create_all()
+def route(rule: str, **options) -> Callable:
+    """Record a view for create_app() to register, like app.route."""
+    def decorator(view):
+        ROUTES.append((rule, view, options))
+        return view
+    return decorator
+
+def command(name: str) -> Callable:
+    """Define a `flask` CLI command for create_app() to register, like app.cli.command."""
+    def decorator(func):
+        cli_command = click.command(name)(with_appcontext(func))
+        COMMANDS.append(cli_command)
+        return cli_command
+    return decorator
+
+def create_app(config: Optional[Mapping[str, Any]] = None) -> Flask:
+    """
+    Create the contract management application.
+
+    Importing this module stays cheap: the PDF import and report modules (pdfplumber
+    and ReportLab) are only loaded when a view first needs them, and the schema is
+    created or upgraded explicitly with `flask db-upgrade` (or reset_db.py), never
+    at import time.
+
+    Args:
+        config (Mapping[str, Any]): Settings overriding the defaults and environment
+
+    Returns:
+        Flask: The configured application
+    """
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'your-secret-key'  # Used for flash messages and session security
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///contracts.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['CONTRACTS_PER_PAGE'] = int(os.environ.get('CONTRACTS_PER_PAGE', 50))
+    app.config['MAX_CONTRACTS_PER_PAGE'] = 500
+    app.config['IMPORT_BATCH_SIZE'] = int(os.environ.get('IMPORT_BATCH_SIZE', 500))
+    app.config['IMPORT_WORKERS'] = int(os.environ.get('IMPORT_WORKERS', 1))  # >1 extracts PDF pages in parallel
+    app.config['REPORT_RENDERER'] = os.environ.get('REPORT_RENDERER', 'platypus')  # or 'canvas' for large reports
+    app.config['SEARCH_CACHE_SIZE'] = int(os.environ.get('SEARCH_CACHE_SIZE', 256))  # per worker, 0 disables
+    app.config['SLOW_QUERY_THRESHOLD_MS'] = int(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200))
+    app.config['METRICS_RESPONSE_HEADERS'] = os.environ.get('METRICS_RESPONSE_HEADERS', '').lower() in ('1', 'true')
+    if config:
+        app.config.update(config)
+
+    storage.init_app(app)
+    metrics.init_app(app)
+    ReportCache(app)
+    ReportJobManager(app)
+    SearchCache(app)
+
+    for rule, view, options in ROUTES:
+        app.add_url_rule(rule, view_func=view, **options)
+    for cli_command in COMMANDS:
+        app.cli.add_command(cli_command)
+    return app
+
+@command('db-upgrade')
+def db_upgrade_command():
+    """Apply pending schema migrations."""
+    click.echo(f"Database schema is at version {upgrade(db.engine)}")
+
+@command('check-query-plans')
+def check_query_plans_command():
+    """Fail if any contract listing query is not served by an index."""
+    with db.engine.connect() as connection:
+        problems = check_query_plans(connection, VALID_SORT_FIELDS)
+    for problem in problems:
+        click.echo(f"Query not served by an index: {problem}", err=True)
+    if problems:
+        raise SystemExit(1)
+    click.echo("All contract listing queries use an index")
+
+@command('rebuild-summary')
+def rebuild_summary_command():
+    """Recompute the contract analytics summary from the contract table."""
+    with db.engine.begin() as connection:
+        rows = rebuild_summary(connection)
+    click.echo(f"Contract summary rebuilt with {rows} rows")
+
+@command('export-csv')
+@click.argument('output', type=click.Path(dir_okay=False, writable=True))
+@click.option('--search-field', default='', help='Field to search in')
+@click.option('--search-term', default='', help='Term to search for')
+@click.option('--sort-by', default='expiration_date', show_default=True)
+@click.option('--order', type=click.Choice(['asc', 'desc']), default='asc', show_default=True)
+@click.option('--min-value', default='', help='Only contracts worth at least this much')
+@click.option('--max-value', default='', help='Only contracts worth at most this much')
+@click.option('--fields', default=None, help='Comma-separated columns (default: all)')
+@click.option('--gzip', 'compress', is_flag=True, help='Write gzip-compressed CSV')
+@click.option('--excel', is_flag=True, help='Start with a UTF-8 byte order mark for Excel')
+def export_csv_command(output, search_field, search_term, sort_by, order, min_value, max_value, fields, compress,
+                       excel):
+    """Export contracts, or the results of a search, to a CSV file."""
+    try:
+        fields = parse_fields(fields)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--fields')
+    error = search_argument_error(search_field, search_term)
+    if error:
+        raise click.UsageError(error)
+    try:
+        min_value, max_value = parse_value_range(min_value, max_value)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    query = contract_listing_query(contract_columns(fields), search_field, search_term, sort_by, order,
+                                   min_value, max_value)
+    chunks = csv_chunks(fields, iter_rows(query), bom=excel)
+    if compress:
+        with open(output, 'wb') as f:
+            for data in gzip_chunks(chunks):
+                f.write(data)
+    else:
+        with open(output, 'w', encoding='utf-8', newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
+    click.echo(f"Contracts exported to {output}")
+
+@command('prerender-reports')
+@click.option('--renderer', type=click.Choice(['platypus', 'canvas']), default=None,
+              help='Report renderer (default: REPORT_RENDERER)')
+@click.option('--workers', type=int, default=None, help='Worker processes (default: one per CPU)')
+@click.option('--force', is_flag=True, help='Render reports that are already cached too')
+@click.option('--watch', is_flag=True, help='Keep running, rendering again after every contract change')
+@click.option('--interval', type=float, default=30, show_default=True, help='Seconds between checks with --watch')
+def prerender_reports_command(renderer, workers, force, watch, interval):
+    """Render the standard reports into the report cache ahead of requests."""
+    if watch:
+        click.echo(f"Watching for contract changes every {interval:g}s, press Ctrl+C to stop")
+        watch_reports(interval, renderer=renderer, workers=workers, force=force)
+        return
+    summary = prerender_reports(renderer=renderer, workers=workers, force=force)
+    click.echo(f"Rendered {summary['rendered']} reports ({summary['skipped']} already cached) "
+               f"from {summary['contracts']} contracts at data version {summary['data_version']}")
+
+@command('import-csv')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', default=1000, show_default=True, help='Rows validated and inserted together')
+def import_csv_command(path, chunk_size):
+    """Bulk import contracts from a CSV file."""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        try:
+            summary = import_contracts_csv(f, chunk_size=chunk_size)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+    for error in summary['errors']:
+        click.echo(f"Line {error['line']} ({error['contract_number'] or 'no contract number'}): "
+                   f"{'; '.join(error['errors'])}", err=True)
+    click.echo(f"Imported {summary['inserted']} of {summary['rows']} contracts, "
+               f"{len(summary['errors'])} rows rejected")
+
+VALID_SORT_FIELDS = ['contract_number', 'contract_name', 'start_date', 'expiration_date', 'value', 'status']
+VALID_SEARCH_FIELDS = ['contract_number', 'contract_name', 'status', 'value', 'notes']
+
+def contract_search_filters(
+    search_field: str = '',
+    search_term: str = '',
+    min_value: Optional[Decimal] = None,
+    max_value: Optional[Decimal] = None
+) -> List[Any]:
+    """
+    Build the filter criteria for a contract search.
+
+    Args:
+        search_field (str): Field to search in ('contract_number', 'contract_name', 'status', 'value', 'notes')
+        search_term (str): Term to search for
+        min_value (Decimal): Only contracts worth at least this much
+        max_value (Decimal): Only contracts worth at most this much
+
+    Returns:
+        List[Any]: SQLAlchemy criteria to apply to a Contract query
+    """
+    # Value ranges are served by the index on (value, id)
+    filters = []
+    if min_value is not None:
+        filters.append(Contract.value >= min_value)
+    if max_value is not None:
+        filters.append(Contract.value <= max_value)
+
+    if not (search_term and search_field):
+        return filters
+
+    # Word-prefix matching through the full-text index where the database supports it
+    fts_filters = fts_search_filters(search_field, search_term)
+    if fts_filters is not None:
+        return fts_filters + filters
+
+    if search_field == 'contract_number':
+        filters.append(Contract.contract_number.ilike(f'%{search_term}%'))
+    elif search_field == 'contract_name':
+        filters.append(Contract.contract_name.ilike(f'%{search_term}%'))
+    elif search_field == 'status':
+        filters.append(Contract.status.ilike(f'%{search_term}%'))
+    elif search_field == 'value':
+        try:
+            filters.append(Contract.value == parse_money(search_term))
+        except ValueError:
+            logger.error(f"Invalid value provided for value search: {search_term}")
+            flash('Please enter a valid number for value search', 'error')
+    elif search_field == 'notes':
+        filters.append(Contract.notes.ilike(f'%{search_term}%'))
+    else:
+        logger.warning(f"Invalid search field provided: {search_field}")
+        flash('Invalid search field', 'error')
+    return filters
+
+def parse_value_range(min_value: str = '', max_value: str = '') -> Tuple[Optional[Decimal], Optional[Decimal]]:
+    """
+    Parse the bounds of a value range filter; an empty bound is open.
+
+    Raises:
+        ValueError: If a bound is not an amount, or min_value exceeds max_value
+    """
+    bounds = []
+    for name, text in (('min_value', min_value), ('max_value', max_value)):
+        text = (text or '').strip()
+        try:
+            bounds.append(parse_money(text) if text else None)
+        except ValueError:
+            raise ValueError(f'Invalid {name}: {text}')
+    if None not in bounds and bounds[0] > bounds[1]:
+        raise ValueError('min_value is greater than max_value')
+    return bounds[0], bounds[1]
+
+def request_value_range() -> Tuple[Optional[Decimal], Optional[Decimal]]:
+    """The min_value/max_value query arguments of the current request, parsed by parse_value_range."""
+    return parse_value_range(request.args.get('min_value', ''), request.args.get('max_value', ''))
+
+def validate_sort_field(sort_by: str) -> str:
+    """Return sort_by if it is a sortable Contract column, otherwise 'expiration_date'."""
+    if sort_by not in VALID_SORT_FIELDS:
+        logger.warning(f"Invalid sort field provided: {sort_by}, defaulting to expiration_date")
+        return 'expiration_date'
+    return sort_by
 
 def search_contracts(
     search_field: str = '',
     search_term: str = '',
     sort_by: str = 'expiration_date',
-    order: str = 'asc'
-) -> List[Contract]:
+    order: str = 'asc',
+    min_value: Optional[Decimal] = None,
+    max_value: Optional[Decimal] = None
+) -> List[ContractRow]:
     """
     Search and sort contracts based on specified criteria.
 
+    Every match is loaded, so the result is not kept in the search cache, which
+    is bounded by entries rather than rows; views list pages through
+    paginate_contracts.
+
     Args:
         search_field (str): Field to search in ('contract_number', 'contract_name', 'status', 'value', 'notes')
         search_term (str): Term to search for
         sort_by (str): Field to sort by (default: 'expiration_date')
         order (str): Sort order ('asc' or 'desc', default: 'asc')
+        min_value (Decimal): Only contracts worth at least this much
+        max_value (Decimal): Only contracts worth at most this much
 
     Returns:
-        List[Contract]: List of filtered and sorted contracts
+        List[ContractRow]: List of filtered and sorted contracts
 
     Raises:
         ValueError: If an invalid value is provided for numeric fields
@@ -47,41 +313,11 @@ def search_contracts(
     logger.info(f"Searching contracts with field: {search_field}, term: {search_term}, sort_by: {sort_by}, order: {order}")
     
     try:
-        query = Contract.query
-
-        if search_term and search_field:
-            if search_field == 'contract_number':
-                query = query.filter(Contract.contract_number.ilike(f'%{search_term}%'))
-            elif search_field == 'contract_name':
-                query = query.filter(Contract.contract_name.ilike(f'%{search_term}%'))
-            elif search_field == 'status':
-                query = query.filter(Contract.status.ilike(f'%{search_term}%'))
-            elif search_field == 'value':
-                try:
-                    value = float(search_term)
-                    query = query.filter(Contract.value == value)
-                except ValueError:
-                    logger.error(f"Invalid value provided for value search: {search_term}")
-                    flash('Please enter a valid number for value search', 'error')
-            elif search_field == 'notes':
-                query = query.filter(Contract.notes.ilike(f'%{search_term}%'))
-            else:
-                logger.warning(f"Invalid search field provided: {search_field}")
-                flash('Invalid search field', 'error')
-
-        # Validate sort_by field
-        valid_sort_fields = ['contract_number', 'contract_name', 'start_date', 'expiration_date', 'value', 'status']
-        if sort_by not in valid_sort_fields:
-            logger.warning(f"Invalid sort field provided: {sort_by}, defaulting to expiration_date")
-            sort_by = 'expiration_date'
-
-        # Apply sorting
-        if order.lower() == 'asc':
-            query = query.order_by(getattr(Contract, sort_by))
-        else:
-            query = query.order_by(getattr(Contract, sort_by).desc())
+        sort_by = validate_sort_field(sort_by)
 
-        contracts = query.all()
+        query = contract_listing_query(contract_columns(EXPORT_FIELDS), search_field, search_term, sort_by, order,
+                                       min_value, max_value)
+        contracts = [ContractRow(*row) for row in db.session.execute(query)]
         logger.info(f"Found {len(contracts)} contracts matching search criteria")
         return contracts
 
@@ -90,7 +326,196 @@ def search_contracts(
         flash('An error occurred while searching contracts', 'error')
         return []
 
-@app.route('/')
+def _cached_search(key: tuple, search_field: str, search_term: str, load):
+    """Run load() through the search cache, unless the search is invalid and must flash its error."""
+    if search_argument_error(search_field, search_term):
+        return load()
+    return current_app.extensions['search_cache'].get_or_load(key, load)
+
+def paginate_contracts(
+    search_field: str = '',
+    search_term: str = '',
+    sort_by: str = 'expiration_date',
+    order: str = 'asc',
+    cursor: Optional[str] = None,
+    per_page: Optional[int] = None,
+    min_value: Optional[Decimal] = None,
+    max_value: Optional[Decimal] = None
+) -> Page:
+    """
+    Search and sort contracts, returning a single keyset-paginated page.
+
+    The page is located by seeking to the cursor's (sort value, id) position, so the
+    cost of a page does not depend on how far into the listing it is.
+
+    Args:
+        search_field (str): Field to search in ('contract_number', 'contract_name', 'status', 'value', 'notes')
+        search_term (str): Term to search for
+        sort_by (str): Field to sort by (default: 'expiration_date')
+        order (str): Sort order ('asc' or 'desc', default: 'asc')
+        cursor (str): Cursor of the page to fetch, None for the first page
+        per_page (int): Page size (default: CONTRACTS_PER_PAGE)
+        min_value (Decimal): Only contracts worth at least this much
+        max_value (Decimal): Only contracts worth at most this much
+
+    Returns:
+        Page: Contracts on the requested page with next/prev cursors
+    """
+    logger.info(f"Paginating contracts with field: {search_field}, term: {search_term}, sort_by: {sort_by}, order: {order}, cursor: {cursor}")
+    per_page = clamp_per_page(per_page)
+
+    try:
+        sort_by = validate_sort_field(sort_by)
+        column = getattr(Contract, sort_by)
+        descending = order.lower() != 'asc'
+
+        def load():
+            query = db.session.query(*contract_columns(EXPORT_FIELDS)).filter(
+                *contract_search_filters(search_field, search_term, min_value, max_value))
+            try:
+                page = keyset_paginate(query, column, Contract.id, descending, cursor, per_page)
+            except ValueError:
+                logger.warning(f"Invalid cursor provided: {cursor}, returning first page")
+                page = keyset_paginate(query, column, Contract.id, descending, per_page=per_page)
+            page.items = [ContractRow(*row) for row in page.items]
+            return page
+
+        page = _cached_search(('page', search_field, search_term, sort_by, descending, cursor, per_page,
+                               min_value, max_value),
+                              search_field, search_term, load)
+        logger.info(f"Returning {len(page.items)} contracts matching search criteria")
+        return page
+
+    except Exception as e:
+        logger.error(f"Error searching contracts: {str(e)}")
+        flash('An error occurred while searching contracts', 'error')
+        return Page(items=[], per_page=per_page)
+
+def contract_listing_query(
+    columns: List[Any],
+    search_field: str = '',
+    search_term: str = '',
+    sort_by: str = 'expiration_date',
+    order: str = 'asc',
+    min_value: Optional[Decimal] = None,
+    max_value: Optional[Decimal] = None
+):
+    """
+    Column-level select of the contracts matching a search, in listing order.
+
+    Args:
+        columns (List[Any]): Contract columns to select
+        search_field (str): Field to search in ('contract_number', 'contract_name', 'status', 'value', 'notes')
+        search_term (str): Term to search for
+        sort_by (str): Field to sort by (default: 'expiration_date')
+        order (str): Sort order ('asc' or 'desc', default: 'asc')
+        min_value (Decimal): Only contracts worth at least this much
+        max_value (Decimal): Only contracts worth at most this much
+
+    Returns:
+        Select: Query ordered by the sort field with id as the tie-breaker
+    """
+    column = getattr(Contract, validate_sort_field(sort_by))
+    query = select(*columns).where(*contract_search_filters(search_field, search_term, min_value, max_value))
+    if order.lower() == 'asc':
+        return query.order_by(column.asc(), Contract.id.asc())
+    return query.order_by(column.desc(), Contract.id.desc())
+
+def search_argument_error(search_field: str, search_term: str) -> Optional[str]:
+    """Why a search cannot be run, for API callers that get errors rather than flashes."""
+    if not (search_term and search_field):
+        return None
+    if search_field not in VALID_SEARCH_FIELDS:
+        return f'Invalid search field: {search_field}'
+    if search_field == 'value':
+        try:
+            parse_money(search_term)
+        except ValueError:
+            return f'Invalid value for value search: {search_term}'
+    return None
+
+def contract_value_totals(
+    search_field: str = '',
+    search_term: str = '',
+    min_value: Optional[Decimal] = None,
+    max_value: Optional[Decimal] = None
+) -> Dict[str, Any]:
+    """
+    Count and exact total, minimum and maximum value of the contracts matching a search.
+
+    The sum runs over integer cents in the database, so totals are exact to the cent.
+    Results are served from the search cache while no contract has changed.
+
+    Returns:
+        Dict[str, Any]: 'count', 'total_value', 'min_value' and 'max_value' (None
+        when nothing matches), amounts as Decimal
+    """
+    def load():
+        count, total, lowest, highest = db.session.execute(
+            select(func.count(Contract.id), func.coalesce(func.sum(Contract.value), 0),
+                   func.min(Contract.value), func.max(Contract.value))
+            .where(*contract_search_filters(search_field, search_term, min_value, max_value))
+        ).one()
+        return {'count': count, 'total_value': total, 'min_value': lowest, 'max_value': highest}
+
+    return _cached_search(('totals', search_field, search_term, min_value, max_value),
+                          search_field, search_term, load)
+
+def clamp_per_page(per_page: Optional[int]) -> int:
+    """Bound a requested page size to 1..MAX_CONTRACTS_PER_PAGE, defaulting to CONTRACTS_PER_PAGE."""
+    if not per_page:
+        return current_app.config['CONTRACTS_PER_PAGE']
+    return max(1, min(per_page, current_app.config['MAX_CONTRACTS_PER_PAGE']))
+
+def page_url(cursor: Optional[str]) -> Optional[str]:
+    """URL of the current view with its query arguments, moved to the given cursor."""
+    if not cursor:
+        return None
+    args = request.args.to_dict()
+    args['cursor'] = cursor
+    return url_for(request.endpoint, **request.view_args, **args)
+
+STREAM_FLUSH_BYTES = 8192
+
+def wants_all() -> bool:
+    """Whether the view should list every matching contract in one streamed page (?all=1)."""
+    return request.args.get('all', '').lower() in ('1', 'true')
+
+def stream_rows(query) -> Iterator[ContractRow]:
+    """Contracts of a column select, read lazily from the database in batches."""
+    return (ContractRow(*row) for row in iter_rows(query))
+
+def stream_page(template_name: str, **context) -> Response:
+    """
+    Render a template progressively instead of building the page in memory.
+
+    The page head and search form are sent as soon as they are rendered, and rows
+    follow as the template consumes its row iterator, in chunks of about
+    STREAM_FLUSH_BYTES.
+
+    Flashed messages are taken from the session before streaming starts: the
+    session cookie is saved with the response headers, so messages read while
+    the body streams would never be cleared. Messages flashed while streaming are
+    not shown.
+    """
+    get_flashed_messages(with_categories=True)  # cached for the template's own call
+    def buffered(chunks: Iterable[str]) -> Iterator[str]:
+        pending, size = [], 0
+        for chunk in chunks:
+            pending.append(chunk)
+            size += len(chunk)
+            if size >= STREAM_FLUSH_BYTES:
+                yield ''.join(pending)
+                pending, size = [], 0
+        if pending:
+            yield ''.join(pending)
+
+    response = Response(buffered(stream_template(template_name, streaming=True, **context)), mimetype='text/html')
+    response.headers['X-Accel-Buffering'] = 'no'  # keep reverse proxies from holding the stream back
+    return response
+
+@route('/')
+@conditional_get
 def index() -> str:
     """
     Main route for displaying and searching contracts.
@@ -102,19 +527,252 @@ def index() -> str:
     search_term = request.args.get('search_term', '')
     sort_by = request.args.get('sort_by', 'expiration_date')
     order = request.args.get('order', 'asc')
+    cursor = request.args.get('cursor')
+    per_page = request.args.get('per_page', type=int)
+    try:
+        min_value, max_value = request_value_range()
+    except ValueError as e:
+        flash(f'{e}, value range ignored', 'error')
+        min_value = max_value = None
+
+    # Count and total of everything matched, not just this page; an invalid search
+    # is left to paginate_contracts, so its error is flashed once
+    totals = None
+    if ((search_term or min_value is not None or max_value is not None)
+            and not search_argument_error(search_field, search_term)):
+        totals = contract_value_totals(search_field, search_term, min_value, max_value)
 
-    contracts = search_contracts(search_field, search_term, sort_by, order)
+    if wants_all():
+        query = contract_listing_query(contract_columns(EXPORT_FIELDS), search_field, search_term, sort_by, order,
+                                       min_value, max_value)
+        return stream_page('index.html',
+                           contracts=stream_rows(query),
+                           summary=get_summary(),
+                           totals=totals,
+                           search_field=search_field,
+                           search_term=search_term,
+                           min_value=request.args.get('min_value', ''),
+                           max_value=request.args.get('max_value', ''),
+                           sort_by=sort_by,
+                           order=order,
+                           title="Hudson County Correctional Facility",
+                           page_title="Contract Management System")
+
+    page = paginate_contracts(search_field, search_term, sort_by, order, cursor, per_page, min_value, max_value)
     
     return render_template('index.html',
-                         contracts=contracts,
+                         contracts=page.items,
+                         summary=get_summary(),
+                         totals=totals,
+                         next_url=page_url(page.next_cursor),
+                         prev_url=page_url(page.prev_cursor),
                          search_field=search_field,
                          search_term=search_term,
+                         min_value=request.args.get('min_value', ''),
+                         max_value=request.args.get('max_value', ''),
                          sort_by=sort_by,
                          order=order,
                          title="Hudson County Correctional Facility",
                          page_title="Contract Management System")
 
-@app.route('/add_contract', methods=['GET', 'POST'])
+@route('/api/contracts/page')
+def contracts_page():
+    """
+    JSON variant of the paginated contract list, accepting the same arguments as index.
+
+    Returns:
+        Response: JSON with the page's contracts and next/prev cursors
+    """
+    try:
+        min_value, max_value = request_value_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    page = paginate_contracts(
+        request.args.get('search_field', ''),
+        request.args.get('search_term', ''),
+        request.args.get('sort_by', 'expiration_date'),
+        request.args.get('order', 'asc'),
+        request.args.get('cursor'),
+        request.args.get('per_page', type=int),
+        min_value,
+        max_value
+    )
+    return jsonify({
+        'contracts': [contract.to_dict() for contract in page.items],
+        'per_page': page.per_page,
+        'next_cursor': page.next_cursor,
+        'prev_cursor': page.prev_cursor,
+    })
+
+@route('/api/contracts')
+def contracts_api():
+    """
+    Stream every contract matching a search, without paging.
+
+    Accepts the index search, value range and sort arguments, plus `fields`
+    (comma-separated columns to return, default all) and `format` ('ndjson', the
+    default, or 'json').
+    Rows are selected as plain columns and written out as they are read from the
+    database cursor, so the full result is never held in memory.
+
+    Returns:
+        Response: Streamed NDJSON lines or a chunked JSON document
+    """
+    search_field = request.args.get('search_field', '')
+    search_term = request.args.get('search_term', '')
+    sort_by = request.args.get('sort_by', 'expiration_date')
+    order = request.args.get('order', 'asc')
+    output_format = request.args.get('format', 'ndjson')
+
+    try:
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if output_format not in ('ndjson', 'json'):
+        return jsonify({'error': f'Invalid format: {output_format}'}), 400
+    if sort_by not in VALID_SORT_FIELDS:
+        return jsonify({'error': f'Invalid sort field: {sort_by}'}), 400
+    error = search_argument_error(search_field, search_term)
+    if error:
+        return jsonify({'error': error}), 400
+    try:
+        min_value, max_value = request_value_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    query = contract_listing_query(contract_columns(fields), search_field, search_term, sort_by, order,
+                                   min_value, max_value)
+    logger.info(f"Streaming contracts as {output_format} with fields: {fields}")
+    rows = iter_rows(query)
+    if output_format == 'json':
+        return Response(stream_with_context(json_array_chunks(fields, rows)), mimetype='application/json')
+    return Response(stream_with_context(ndjson_lines(fields, rows)), mimetype='application/x-ndjson')
+
+@route('/api/contracts/totals')
+def contracts_totals():
+    """
+    Count and exact total value of the contracts matching a search, e.g. every
+    contract over $250k with ?min_value=250000.
+
+    Accepts the index search and value range arguments.
+
+    Returns:
+        Response: JSON with 'count', 'total_value', 'min_value' and 'max_value'
+    """
+    search_field = request.args.get('search_field', '')
+    search_term = request.args.get('search_term', '')
+    error = search_argument_error(search_field, search_term)
+    if error:
+        return jsonify({'error': error}), 400
+    try:
+        min_value, max_value = request_value_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    totals = contract_value_totals(search_field, search_term, min_value, max_value)
+    return jsonify({name: money_json(value) for name, value in totals.items()})
+
+@route('/export/contracts.csv')
+def export_contracts_csv():
+    """
+    Download contracts, or the results of a search, as CSV.
+
+    Accepts the /api/contracts arguments except `format`, plus `gzip=1` to compress
+    the download and `excel=1` to add the byte order mark Excel needs for UTF-8.
+
+    Returns:
+        Response: CSV streamed batch by batch as rows are read from the database
+    """
+    search_field = request.args.get('search_field', '')
+    search_term = request.args.get('search_term', '')
+    sort_by = request.args.get('sort_by', 'expiration_date')
+    order = request.args.get('order', 'asc')
+    compress = request.args.get('gzip', '').lower() in ('1', 'true')
+    excel = request.args.get('excel', '').lower() in ('1', 'true')
+
+    try:
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if sort_by not in VALID_SORT_FIELDS:
+        return jsonify({'error': f'Invalid sort field: {sort_by}'}), 400
+    error = search_argument_error(search_field, search_term)
+    if error:
+        return jsonify({'error': error}), 400
+    try:
+        min_value, max_value = request_value_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    query = contract_listing_query(contract_columns(fields), search_field, search_term, sort_by, order,
+                                   min_value, max_value)
+    chunks = csv_chunks(fields, iter_rows(query), bom=excel)
+    download_name = f"contracts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    headers = {}
+    if compress:
+        chunks = gzip_chunks(chunks)
+        download_name += '.gz'
+    headers['Content-Disposition'] = f'attachment; filename="{download_name}"'
+    mimetype = 'application/gzip' if compress else 'text/csv'
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+@route('/api/summary')
+def contract_summary():
+    """
+    Dashboard figures: totals by status, contracts expiring in the next 30/60/90
+    days and contracts by expiration month.
+
+    Returns:
+        Response: JSON read from the precomputed contract summary
+    """
+    return jsonify(get_summary())
+
+@route('/api/changes')
+def contract_changes():
+    """
+    Contracts inserted, updated or deleted since a client's last sync.
+
+    `since` is the cursor returned by the previous call (0 or absent for the whole
+    history, `latest` for the current position without any changes). Each changed
+    contract is listed once with its current data, at most `limit` per call;
+    while `has_more` is true, call again with the returned cursor.
+
+    Change ids restart when the database is recreated, so every response carries
+    the database's `epoch`, which clients pass back with their cursor. A cursor
+    from another epoch, or beyond the end of the log, cannot be continued: the
+    answer is 410 with `reset: true`, and the client must discard its copy and
+    sync again from since=0.
+
+    Returns:
+        Response: JSON with 'changes', 'cursor', 'has_more' and 'epoch'
+    """
+    epoch = get_data_stamp().epoch
+    since = request.args.get('since', '0')
+    if since == 'latest':
+        return jsonify({'changes': [], 'cursor': latest_change_id(), 'has_more': False, 'epoch': epoch})
+    try:
+        since = int(since or 0)
+        limit = int(request.args.get('limit', CHANGES_PER_PAGE))
+    except ValueError:
+        return jsonify({'error': 'since and limit must be integers'}), 400
+    if since < 0:
+        return jsonify({'error': f'Invalid since: {since}'}), 400
+
+    client_epoch = request.args.get('epoch')
+    if since and ((client_epoch and client_epoch != epoch) or since > latest_change_id()):
+        return jsonify({'error': 'The change log was reset, sync again from since=0',
+                        'reset': True, 'cursor': 0, 'epoch': epoch}), 410
+
+    changes = get_changes(since, max(1, min(limit, MAX_CHANGES_PER_PAGE)))
+    changes['epoch'] = epoch
+    return jsonify(changes)
+
+@route('/metrics')
+def metrics_endpoint():
+    """Request, query and phase timings in the Prometheus text format."""
+    return metrics.render()
+
+@route('/add_contract', methods=['GET', 'POST'])
 def add_contract():
     if request.method == 'POST':
         contract_number = request.form.get('contract_number', '').strip()
@@ -146,7 +804,7 @@ def add_contract():
                 contract_name=contract_name,
                 start_date=start_date,
                 expiration_date=expiration_date,
-                value=float(value),
+                value=parse_money(value or ''),
                 status=status,
                 notes=notes
             )
@@ -160,7 +818,7 @@ def add_contract():
 
     return render_template('add_contract.html')
 
-@app.route('/edit_contract/<int:id>', methods=['GET', 'POST'])
+@route('/edit_contract/<int:id>', methods=['GET', 'POST'])
 def edit_contract(id):
     contract = Contract.query.get_or_404(id)
     if request.method == 'POST':
@@ -188,7 +846,7 @@ def edit_contract(id):
             expiration_date = request.form.get('expiration_date')
             contract.start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else None
             contract.expiration_date = datetime.strptime(expiration_date, '%Y-%m-%d').date() if expiration_date else None
-            contract.value = float(request.form.get('value'))
+            contract.value = parse_money(request.form.get('value', ''))
             contract.status = request.form.get('status')
             contract.notes = request.form.get('notes')
             
@@ -201,7 +859,7 @@ def edit_contract(id):
 
     return render_template('edit_contract.html', contract=contract)
 
-@app.route('/delete_contract/<int:id>')
+@route('/delete_contract/<int:id>')
 def delete_contract(id):
     contract = Contract.query.get_or_404(id)
     try:
@@ -212,43 +870,146 @@ def delete_contract(id):
         flash(f'Error deleting contract: {str(e)}', 'error')
     return redirect(url_for('index'))
 
-@app.route('/import_pdf')
+@route('/import_pdf')
 def import_pdf():
     try:
         pdf_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Contract_hccc.pdf')
         if not os.path.exists(pdf_path):
             flash(f'PDF file not found at: {pdf_path}', 'error')
             return redirect(url_for('index'))
-        
-        extract_pdf_data(pdf_path)
-        flash('PDF imported successfully!', 'success')
+
+        from pdf_operations import import_pdf_incremental  # pdfplumber is only loaded when needed
+        summary = import_pdf_incremental(pdf_path, batch_size=current_app.config['IMPORT_BATCH_SIZE'],
+                                         workers=current_app.config['IMPORT_WORKERS'])
+        if summary['file_unchanged']:
+            flash('PDF unchanged since the last import, nothing to do.', 'success')
+        else:
+            flash(f"PDF imported successfully! {summary['pages_changed']} of {summary['pages']} pages changed: "
+                  f"{summary['inserted']} added, {summary['updated']} updated, "
+                  f"{summary['removed']} removed.", 'success')
         return redirect(url_for('index'))
     except Exception as e:
         flash(f'Error importing PDF: {str(e)}', 'error')
         return redirect(url_for('index'))
 
-@app.route('/generate_report')
+@route('/import_csv', methods=['POST'])
+def import_csv():
+    """
+    Bulk import contracts from an uploaded CSV file.
+
+    Rows that fail validation or duplicate an existing contract number are reported
+    and skipped; the valid rows are imported. With format=json the full summary,
+    including every rejected row, is returned instead of redirecting.
+    """
+    wants_json = request.args.get('format') == 'json'
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        if wants_json:
+            return jsonify({'error': 'No CSV file uploaded'}), 400
+        flash('Please choose a CSV file to import', 'error')
+        return redirect(url_for('index'))
+
+    try:
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        summary = import_contracts_csv(stream, chunk_size=current_app.config['IMPORT_BATCH_SIZE'])
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        if wants_json:
+            return jsonify({'error': str(e)}), 400
+        flash(f'Error importing CSV: {str(e)}', 'error')
+        return redirect(url_for('index'))
+
+    if wants_json:
+        return jsonify(summary)
+    flash(f"CSV imported: {summary['inserted']} of {summary['rows']} contracts added.", 'success')
+    if summary['errors']:
+        shown = summary['errors'][:5]
+        details = '; '.join(f"line {error['line']}: {', '.join(error['errors'])}" for error in shown)
+        more = f" and {len(summary['errors']) - len(shown)} more" if len(summary['errors']) > len(shown) else ''
+        flash(f"{len(summary['errors'])} rows rejected ({details}{more})", 'warning')
+    return redirect(url_for('index'))
+
+@route('/generate_report')
+@conditional_get
 def generate_report():
-    sort_by = request.args.get('sort_by', 'expiration_date')
-    order = request.args.get('order', 'asc')
-    active_only = request.args.get('active_only', 'false').lower() == 'true'
-    report_type = request.args.get('report_type')
-    
-    # Generate unique filename based on parameters
+    params = normalize_report_params(
+        request.args.get('sort_by', 'expiration_date'),
+        request.args.get('order', 'asc'),
+        request.args.get('active_only', 'false'),
+        request.args.get('report_type'),
+        request.args.get('renderer', current_app.config['REPORT_RENDERER'])
+    )
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f'contract_report_{timestamp}.pdf'
-    output_path = os.path.join(app.root_path, 'static', 'reports', filename)
-    
-    # Ensure reports directory exists
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    # Generate the report
-    generate_pdf_report(output_path, sort_by=sort_by, order=order, active_only=active_only, report_type=report_type)
+    download_name = f'contract_report_{timestamp}.pdf'
     
-    # Return the file
-    return send_file(output_path, as_attachment=True)
+    # Serve the cached copy unless a contract changed since it was rendered
+    stamp = get_data_stamp()
+    report_cache = current_app.extensions['report_cache']
+    output_path = report_cache.get(params, stamp)
+    if output_path is not None:
+        return send_file(output_path, as_attachment=True, download_name=download_name)
 
-@app.route('/search')
+    from pdf_operations import generate_pdf_report  # ReportLab is only loaded when needed
+    if params['renderer'] == 'canvas':
+        # Respond straight from memory; the cache gets its copy from the same bytes
+        buffer = io.BytesIO()
+        generate_pdf_report(buffer, **params)
+        report_cache.put(params, stamp, lambda path: _write_bytes(path, buffer.getvalue()))
+        buffer.seek(0)
+        return send_file(buffer, mimetype='application/pdf', as_attachment=True, download_name=download_name)
+
+    output_path = report_cache.put(params, stamp,
+                                   lambda path: generate_pdf_report(path, **params))
+    return send_file(output_path, as_attachment=True, download_name=download_name)
+
+def _write_bytes(path: str, data: bytes) -> None:
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def _report_job_response(job) -> Dict[str, Any]:
+    """Status payload for a report job, with links to poll and download it."""
+    response = job.to_dict()
+    response['status_url'] = url_for('report_job_status', job_id=job.id)
+    response['download_url'] = url_for('download_report_job', job_id=job.id) if job.status == DONE else None
+    return response
+
+@route('/reports/jobs', methods=['POST'])
+def create_report_job():
+    """
+    Start generating a report in the background. Accepts the /generate_report parameters.
+
+    Returns:
+        Response: 202 with the job status; identical in-flight requests share a job
+    """
+    params = normalize_report_params(
+        request.values.get('sort_by', 'expiration_date'),
+        request.values.get('order', 'asc'),
+        request.values.get('active_only', 'false'),
+        request.values.get('report_type'),
+        request.values.get('renderer', current_app.config['REPORT_RENDERER'])
+    )
+    job = current_app.extensions['report_jobs'].submit(params)
+    return jsonify(_report_job_response(job)), 202
+
+@route('/reports/jobs/<job_id>')
+def report_job_status(job_id):
+    job = current_app.extensions['report_jobs'].get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown report job'}), 404
+    return jsonify(_report_job_response(job))
+
+@route('/reports/jobs/<job_id>/download')
+def download_report_job(job_id):
+    job = current_app.extensions['report_jobs'].get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown report job'}), 404
+    if job.status != DONE:
+        return jsonify(_report_job_response(job)), 409
+    if not os.path.exists(job.output_path):
+        return jsonify({'error': 'Report was superseded by newer contract data, please request it again'}), 410
+    return send_file(job.output_path, as_attachment=True, download_name='contract_report.pdf')
+
+@route('/search')
+@conditional_get
 def search():
     search_term = request.args.get('query', '').strip()
     search_field = request.args.get('field', 'contract_name')
@@ -256,6 +1017,23 @@ def search():
     if not search_term:
         return redirect(url_for('index'))
     
+    per_page = clamp_per_page(request.args.get('per_page', type=int))
+    cursor = request.args.get('cursor')
+
+    # Full-text matches are listed best match first
+    matches = ranked_fts_matches(search_field, search_term)
+    if wants_all():
+        return _stream_search_results(matches, search_term, search_field)
+    if matches is not None:
+        query = Contract.query.join(matches, matches.c.rowid == Contract.id).add_columns(matches.c.rank)
+        try:
+            page = keyset_paginate(query, matches.c.rank, Contract.id, cursor=cursor, per_page=per_page,
+                                   key=lambda row: (row.rank, row.Contract.id))
+        except ValueError:
+            return redirect(url_for('search', query=search_term, field=search_field))
+        page.items = [row.Contract for row in page.items]
+        return _render_search_page(page, search_term, search_field)
+
     # Create the base query
     query = Contract.query
     
@@ -268,7 +1046,7 @@ def search():
         query = query.filter(Contract.status.ilike(f'%{search_term}%'))
     elif search_field == 'value':
         try:
-            search_value = float(search_term)
+            search_value = parse_money(search_term)
             query = query.filter(Contract.value == search_value)
         except ValueError:
             flash('Please enter a valid number for value search', 'error')
@@ -276,17 +1054,42 @@ def search():
     elif search_field == 'notes':
         query = query.filter(Contract.notes.ilike(f'%{search_term}%'))
     
-    # Execute the query
-    contracts = query.all()
+    # Execute the query, one page at a time
+    try:
+        page = keyset_paginate(query, Contract.id, Contract.id, cursor=cursor, per_page=per_page)
+    except ValueError:
+        return redirect(url_for('search', query=search_term, field=search_field))
     
+    return _render_search_page(page, search_term, search_field)
+
+def _stream_search_results(matches, search_term: str, search_field: str) -> Response:
+    """Stream every /search result in one page, in the order the paginated view uses."""
+    query = select(*contract_columns(EXPORT_FIELDS))
+    if matches is not None:
+        query = query.join(matches, matches.c.rowid == Contract.id).order_by(matches.c.rank, Contract.id)
+    else:
+        if search_field == 'value' and search_argument_error(search_field, search_term):
+            flash('Please enter a valid number for value search', 'error')
+            return redirect(url_for('index'))
+        query = query.where(*contract_search_filters(search_field, search_term)).order_by(Contract.id)
+    return stream_page('index.html', contracts=stream_rows(query),
+                       search_term=search_term, search_field=search_field)
+
+def _render_search_page(page: Page, search_term: str, search_field: str) -> str:
+    """Render a page of /search results with the contract list template."""
     # Flash a message if no results found
-    if not contracts:
+    if not page.items:
         flash(f'No contracts found matching "{search_term}" in {search_field}', 'info')
     
     return render_template('index.html', 
-                         contracts=contracts, 
+                         contracts=page.items, 
+                         next_url=page_url(page.next_cursor),
+                         prev_url=page_url(page.prev_cursor),
                          search_term=search_term, 
                          search_field=search_field)
 
 if __name__ == '__main__':
+    app = create_app()
+    with app.app_context():
+        upgrade(db.engine)
     app.run(debug=True, port=5001)
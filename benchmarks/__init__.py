@@ -0,0 +1 @@
+"""Benchmarks for the contract management hot paths. Run modules with `python -m benchmarks.<name>`."""
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark of the PDF line tokenizer on the lines of Contract_hccc.pdf.
+
+Checks first that classify_token agrees with the original parse_date/parse_value
+decisions for every token, then times both over the same lines.
+
+Usage: python -m benchmarks.bench_tokenizer [--pdf PATH] [--rounds N]
+"""
+import argparse
+import os
+import timeit
+
+import pdfplumber
+
+from pdf_operations import (
+    NO_AWARD_MARKERS, TOKEN_AMOUNT, TOKEN_DATE, TOKEN_NO_AWARD, TOKEN_TEXT,
+    classify_token, clean_text, parse_date, parse_value
+)
+
+DEFAULT_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Contract_hccc.pdf')
+
+def legacy_classify(part):
+    """The per-token checks extract_pdf_data made before classify_token existed."""
+    date = parse_date(part)
+    if date:
+        return TOKEN_DATE, date
+    if part.startswith('$') or part.replace(',', '').replace('.', '').isdigit():
+        return TOKEN_AMOUNT, parse_value(part)
+    if part.lower() in NO_AWARD_MARKERS:
+        return TOKEN_NO_AWARD, None
+    return TOKEN_TEXT, None
+
+def load_tokens(pdf_path):
+    tokens = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            for line in (page.extract_text() or '').split('\n'):
+                tokens.extend(clean_text(line).split())
+    return tokens
+
+def check_parity(tokens):
+    mismatches = [t for t in tokens if legacy_classify(t) != classify_token(t)]
+    if mismatches:
+        raise SystemExit(f"classify_token disagrees with parse_date/parse_value on: {mismatches}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pdf', default=DEFAULT_PDF)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    tokens = load_tokens(args.pdf)
+    check_parity(tokens)
+
+    def run_legacy():
+        for token in tokens:
+            legacy_classify(token)
+
+    def run_compiled():
+        # One import's worth of work: the memo starts empty each round
+        classify_token.cache_clear()
+        for token in tokens:
+            classify_token(token)
+
+    legacy = min(timeit.repeat(run_legacy, number=args.rounds, repeat=3)) / args.rounds
+    compiled = min(timeit.repeat(run_compiled, number=args.rounds, repeat=3)) / args.rounds
+    print(f"{len(tokens)} tokens, parity OK")
+    print(f"legacy parse_date/parse_value: {legacy * 1e6:10.1f} us per pass")
+    print(f"classify_token:                {compiled * 1e6:10.1f} us per pass")
+    print(f"speedup:                       {legacy / compiled:10.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+"""
+Time the contract management hot paths and compare runs.
+
+Covers the paginated contract listing (paginate_contracts) for every search
+field, sort field and order, later pages reached by cursor, the full-text
+/search view, a value range listing and its totals, both report layouts with
+both renderers, extract_pdf_data on a synthetic PDF (imported into a scratch
+copy of the database) and the index page. Results are written as JSON; given a
+baseline, any benchmark whose median is slower by more than the threshold fails
+the run.
+
+Usage:
+    python -m benchmarks.synthetic --rows 100000 --replace
+    python -m benchmarks.harness --output before.json
+    python -m benchmarks.harness --baseline before.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+
+SEARCH_TERMS = {
+    'contract_number': 'SYN-00001',
+    'contract_name': 'Medical',
+    'status': 'Active',
+    'value': None,  # taken from an existing contract, since values are random
+    'notes': 'renewal',
+}
+VALUE_RANGE = (Decimal('250000'), None)  # "every contract over $250k"
+DEEP_PAGE_OFFSET = 5000  # rows skipped before the cursor of the later-page benchmarks
+REPORT_VARIANTS = [
+    (report_type, renderer)
+    for report_type in ('simplified', None)
+    for renderer in ('platypus', 'canvas')
+]
+
+def measure(func, repeat, setup=None):
+    """Run func `repeat` times and return its timings in seconds, calling setup (untimed) before each run."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def summarize(timings):
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'max': max(timings),
+        'runs': len(timings),
+    }
+
+def copy_database(app, path):
+    """Replace the SQLite database at path with a consistent copy of app's database."""
+    from models import db
+
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    with app.app_context():
+        source = db.engine.raw_connection()
+        target = sqlite3.connect(path)
+        try:
+            source.driver_connection.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+def benchmarks(app, pdf_path, scratch_dir):
+    """
+    Yield (name, callable, setup) for every benchmark, in the order they are run.
+
+    setup is None or is called before every run, outside the timing. Benchmarks
+    that write do so in a scratch copy of the database in scratch_dir.
+    """
+    from app import (VALID_SEARCH_FIELDS, VALID_SORT_FIELDS, contract_value_totals, create_app,
+                     paginate_contracts)
+    from search_index import FTS_COLUMNS
+    from models import Contract, db
+    from pagination import encode_cursor
+    from pdf_operations import extract_pdf_data, generate_pdf_report
+
+    with app.app_context():
+        sample = Contract.query.order_by(Contract.id).first()
+    terms = dict(SEARCH_TERMS, value=str(sample.value) if sample else '0')
+
+    for field in VALID_SEARCH_FIELDS:
+        for sort_by in VALID_SORT_FIELDS:
+            for order in ('asc', 'desc'):
+                def run(field=field, sort_by=sort_by, order=order):
+                    with app.test_request_context():
+                        paginate_contracts(field, terms[field], sort_by, order)
+                yield f'paginate_contracts[{field},{sort_by},{order}]', run, None
+
+    # A page well into the listing, reached by keyset seek from a cursor
+    for sort_by in VALID_SORT_FIELDS:
+        for order in ('asc', 'desc'):
+            column = getattr(Contract, sort_by)
+            ordering = (column.desc(), Contract.id.desc()) if order == 'desc' else (column, Contract.id)
+            with app.app_context():
+                row = Contract.query.order_by(*ordering).offset(DEEP_PAGE_OFFSET).first()
+            cursor = encode_cursor(getattr(row, sort_by), row.id) if row else None
+
+            def run(sort_by=sort_by, order=order, cursor=cursor):
+                with app.test_request_context():
+                    paginate_contracts(sort_by=sort_by, order=order, cursor=cursor)
+            yield f'paginate_contracts[cursor+{DEEP_PAGE_OFFSET},{sort_by},{order}]', run, None
+
+    min_value, max_value = VALUE_RANGE
+    for sort_by in ('value', 'expiration_date'):
+        def run(sort_by=sort_by):
+            with app.test_request_context():
+                paginate_contracts(sort_by=sort_by, min_value=min_value, max_value=max_value)
+        yield f'paginate_contracts[value>={min_value},{sort_by},asc]', run, None
+
+    def run():
+        with app.test_request_context():
+            contract_value_totals(min_value=min_value, max_value=max_value)
+    yield f'contract_value_totals[value>={min_value}]', run, None
+
+    for report_type, renderer in REPORT_VARIANTS:
+        def run(report_type=report_type, renderer=renderer):
+            with app.app_context(), tempfile.TemporaryDirectory() as directory:
+                generate_pdf_report(os.path.join(directory, 'report.pdf'), report_type=report_type,
+                                    renderer=renderer)
+        yield f'generate_pdf_report[{report_type or "full"},{renderer}]', run, None
+
+    client = app.test_client()
+    # Full-text matches ranked by ranked_fts_matches, as the /search view serves them
+    for field in FTS_COLUMNS:
+        def run(field=field):
+            response = client.get('/search', query_string={'field': field, 'query': terms[field]})
+            assert response.status_code == 200
+        yield f'search[{field}]', run, None
+
+    for sort_by, order in (('expiration_date', 'asc'), ('value', 'desc'), ('contract_name', 'asc')):
+        def run(sort_by=sort_by, order=order):
+            response = client.get('/', query_string={'sort_by': sort_by, 'order': order})
+            assert response.status_code == 200
+        yield f'index[{sort_by},{order}]', run, None
+
+    # Every run imports into a fresh copy of the database, so each one times the
+    # inserts and the measured database is left unchanged
+    if pdf_path:
+        scratch_path = os.path.join(scratch_dir, 'scratch.db')
+        scratch_app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{scratch_path}',
+                                  'REPORT_DIR': os.path.join(scratch_dir, 'reports')})
+
+        def setup():
+            with scratch_app.app_context():
+                db.engine.dispose()
+            copy_database(app, scratch_path)
+
+        def run():
+            with scratch_app.app_context():
+                assert extract_pdf_data(pdf_path, workers=scratch_app.config['IMPORT_WORKERS']) is not False
+        yield 'extract_pdf_data', run, setup
+
+def compare(results, baseline, threshold):
+    """
+    Benchmarks whose median regressed by more than `threshold` (a fraction).
+
+    Returns:
+        list: (name, baseline median, current median) for every regression
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if previous and result['median'] > previous['median'] * (1 + threshold):
+            regressions.append((name, previous['median'], result['median']))
+    return regressions
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per benchmark')
+    parser.add_argument('--only', help='Run only benchmarks whose name contains this text')
+    parser.add_argument('--pdf', help='Contract PDF for extract_pdf_data (default: synthesize one)')
+    parser.add_argument('--pdf-contracts', type=int, default=2000, help='Contracts in the synthesized PDF')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed slowdown against the baseline, as a fraction (default 0.2)')
+    args = parser.parse_args()
+
+    from app import create_app
+    from models import Contract
+    from benchmarks.synthetic import write_contract_pdf
+
+    app = create_app({'SEARCH_CACHE_SIZE': 0})  # time the queries, not cache hits
+    with app.app_context():
+        rows = Contract.query.count()
+    if not rows:
+        raise SystemExit('The database is empty; fill it first with python -m benchmarks.synthetic --rows N')
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = args.pdf
+        if pdf_path is None and (not args.only or args.only in 'extract_pdf_data'):
+            pdf_path = os.path.join(directory, 'synthetic.pdf')
+            write_contract_pdf(pdf_path, args.pdf_contracts)
+
+        results = {}
+        for name, run, setup in benchmarks(app, pdf_path, directory):
+            if args.only and args.only not in name:
+                continue
+            results[name] = summarize(measure(run, args.repeat, setup))
+            print(f"{name:60s} {results[name]['median'] * 1000:10.1f} ms", flush=True)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'contracts': rows,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms "
+                  f"(+{(after / before - 1) * 100:.0f}%)", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No benchmark slower than the baseline by more than {args.threshold:.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Measure the cold-start cost of the application.
+
+Each run starts a fresh interpreter that imports app and calls create_app(), as a
+new worker process does, and times it. With --importtime the slowest imports are
+listed from `python -X importtime`, to check that heavy modules such as
+pdf_operations (pdfplumber, ReportLab) are no longer loaded at startup.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 20 --importtime
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+STARTUP_CODE = 'import app; app.create_app()'
+WATCHED_MODULES = ('pdf_operations', 'pdfplumber', 'reportlab')
+
+def project_root():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def time_startup():
+    """Seconds a fresh interpreter takes to import app and create it, interpreter startup excluded."""
+    code = ('import time; start = time.perf_counter(); '
+            f'{STARTUP_CODE}; print(time.perf_counter() - start)')
+    result = subprocess.run([sys.executable, '-c', code], cwd=project_root(), capture_output=True,
+                            text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+def import_times():
+    """
+    Cumulative import time of every module loaded during startup.
+
+    Returns:
+        dict: Module name -> cumulative microseconds, from `python -X importtime`
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP_CODE], cwd=project_root(),
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = (part.strip() for part in line[len('import time:'):].split('|'))
+        times[module.strip()] = int(cumulative)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10, help='Fresh interpreters to time')
+    parser.add_argument('--importtime', action='store_true', help='List the slowest imports')
+    parser.add_argument('--top', type=int, default=15, help='Imports listed with --importtime')
+    args = parser.parse_args()
+
+    timings = [time_startup() for _ in range(args.repeat)]
+    print(f"import app + create_app(): median {statistics.median(timings) * 1000:.1f} ms, "
+          f"min {min(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms ({args.repeat} runs)")
+
+    if args.importtime:
+        times = import_times()
+        print(f"\n{'cumulative ms':>14}  module")
+        for module, cumulative in sorted(times.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"{cumulative / 1000:14.1f}  {module}")
+        loaded = [module for module in WATCHED_MODULES if module in times]
+        print(f"\nLoaded at startup: {', '.join(loaded)}" if loaded
+              else f"\nNot loaded at startup: {', '.join(WATCHED_MODULES)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+Synthetic contract data for benchmarks.
+
+Fills the application database with realistic contracts and writes contract PDFs
+in the Contract_hccc.pdf layout, both reproducibly from a seed.
+
+Usage:
+    python -m benchmarks.synthetic --rows 100000 [--replace]
+    python -m benchmarks.synthetic --pdf synthetic.pdf --pdf-contracts 10000
+"""
+import argparse
+import random
+from datetime import date, timedelta
+from itertools import islice
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfgen import canvas
+
+VENDOR_WORDS = [
+    'Wellpath', 'Keefe', 'IDEMIA', 'Mason', 'Correct', 'Fowler', 'Summit', 'Aramark', 'Securus',
+    'Metro', 'Garden State', 'Hudson', 'Atlantic', 'Liberty', 'Northeast', 'Tri-County',
+]
+SERVICE_WORDS = [
+    'Medical', 'Surgical', 'Supplies', 'Janitorial', 'Laundry', 'Detergent', 'Food', 'Services',
+    'Maintenance', 'Repair', 'Annual', 'Support', 'Training', 'Equipment', 'Mattresses', 'Paper',
+    'Commissary', 'Pharmacy', 'Software', 'Upgrade', 'Plan', 'Inmate', 'Transport', 'Uniforms',
+    'Security', 'Monitoring', 'Electronic', 'Dental', 'Vision', 'Chemicals', 'Dispensers', 'Re-bid',
+]
+NOTE_PHRASES = [
+    'Renewal option for one additional year', 'State contract pricing applies', 'Awaiting resolution',
+    'Emergency procurement', 'Bid opened', 'Amended by resolution', 'Annual support included',
+]
+STATUS_WEIGHTS = [('Active', 60), ('Expired', 20), ('Pending', 8), ('State Contract', 7), ('Terminated', 5)]
+
+PDF_COLUMNS = [28, 59, 267, 343, 419]  # x of '#', name, start date, expiration, amount
+PDF_NAME_WIDTH = 200
+PDF_LEADING = 15
+
+def contract_name(rng):
+    words = [rng.choice(VENDOR_WORDS)] + rng.sample(SERVICE_WORDS, rng.randint(1, 5))
+    return ' '.join(words)
+
+def generate_contracts(count, seed=0, start=1):
+    """
+    Yield `count` contract rows as dicts ready for an INSERT into the contract table.
+
+    Dates spread over roughly four years around today, values are log-uniform
+    between $1k and $10M, and the status mix follows the real contract list.
+    """
+    rng = random.Random(seed)
+    statuses, weights = zip(*STATUS_WEIGHTS)
+    today = date.today()
+    for number in range(start, start + count):
+        status = rng.choices(statuses, weights)[0]
+        start_date = expiration_date = None
+        if status not in ('Pending', 'State Contract'):
+            start_date = today + timedelta(days=rng.randint(-3 * 365, 365))
+            expiration_date = start_date + timedelta(days=rng.choice([365, 730, 1095]) + rng.randint(-5, 5))
+        yield {
+            'contract_number': f'SYN-{number:07d}',
+            'contract_name': contract_name(rng),
+            'start_date': start_date,
+            'expiration_date': expiration_date,
+            'value': round(10 ** rng.uniform(3, 7), 2),
+            'status': status,
+            'notes': rng.choice(NOTE_PHRASES) if rng.random() < 0.3 else None,
+        }
+
+def fill_database(count, seed=0, batch_size=5000, replace=False):
+    """
+    Insert `count` synthetic contracts into the application database.
+
+    Must run inside an app context. Refuses to touch a database that already holds
+    contracts unless `replace` is set, in which case it is reset first.
+
+    Returns:
+        int: Number of contracts inserted
+    """
+    from sqlalchemy import insert
+
+    from migrations import upgrade
+    from models import db, Contract
+
+    if Contract.query.limit(1).count():
+        if not replace:
+            raise SystemExit('The database already holds contracts; pass --replace to reset it first')
+        db.session.remove()
+        db.drop_all()
+        upgrade(db.engine)
+
+    rows = generate_contracts(count, seed)
+    inserted = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        db.session.execute(insert(Contract), batch)
+        inserted += len(batch)
+    db.session.commit()
+    return inserted
+
+def write_contract_pdf(path, count, seed=0):
+    """
+    Write a contract list PDF in the layout of Contract_hccc.pdf.
+
+    Each contract is a numbered line with its name, start and expiration dates and
+    amount. Long names wrap onto continuation lines, sometimes across a page break.
+
+    Returns:
+        int: Number of pages written
+    """
+    rng = random.Random(seed)
+    width, height = letter
+    pdf = canvas.Canvas(path, pagesize=letter)
+    font, size = 'Helvetica', 12
+    top, bottom = height - 100, 50
+    y = top
+
+    def new_page(first):
+        nonlocal y
+        if not first:
+            pdf.showPage()
+        pdf.setFont(font, size)
+        y = top
+        if first:
+            for x, text in zip(PDF_COLUMNS, ['#', 'Contract', 'Date', 'Expiration', 'Amount']):
+                pdf.drawString(x, y, text)
+            y -= PDF_LEADING
+
+    new_page(first=True)
+    today = date.today()
+    for number in range(1, count + 1):
+        lines = simpleSplit(contract_name(rng), font, size, PDF_NAME_WIDTH)
+        if y < bottom:
+            new_page(first=False)
+        pdf.drawString(PDF_COLUMNS[0], y, str(number))
+        pdf.drawString(PDF_COLUMNS[1], y, lines[0])
+        if rng.random() < 0.95:
+            start_date = today + timedelta(days=rng.randint(-3 * 365, 365))
+            expiration_date = start_date + timedelta(days=rng.choice([365, 730]))
+            pdf.drawString(PDF_COLUMNS[2], y, start_date.strftime('%m/%d/%Y'))
+            pdf.drawString(PDF_COLUMNS[3], y, expiration_date.strftime('%m/%d/%Y'))
+            pdf.drawString(PDF_COLUMNS[4], y, '${:,.2f}'.format(10 ** rng.uniform(3, 7)))
+        else:
+            pdf.drawString(PDF_COLUMNS[2], y, 'Not Available')
+        y -= PDF_LEADING
+        for line in lines[1:]:
+            if y < bottom:
+                new_page(first=False)
+            pdf.drawString(PDF_COLUMNS[1], y, line)
+            y -= PDF_LEADING
+    pdf.save()
+    return pdf.getPageNumber()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=0, help='Contracts to insert into the database (10k to 1M)')
+    parser.add_argument('--replace', action='store_true', help='Reset a non-empty database first')
+    parser.add_argument('--pdf', help='Write a synthetic contract PDF to this path')
+    parser.add_argument('--pdf-contracts', type=int, default=10000, help='Contracts listed in the PDF')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.rows:
+        from app import create_app
+        from migrations import upgrade
+        from models import db
+        app = create_app()
+        with app.app_context():
+            upgrade(db.engine)
+            print(f"Inserted {fill_database(args.rows, args.seed, replace=args.replace)} contracts")
+    if args.pdf:
+        pages = write_contract_pdf(args.pdf, args.pdf_contracts, args.seed)
+        print(f"Wrote {args.pdf_contracts} contracts on {pages} pages to {args.pdf}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+from typing import Any, Dict
+
+from sqlalchemy import and_, event, exists, select, text
+from sqlalchemy.orm import aliased
+
+from contract_export import EXPORT_FIELDS, contract_columns
+from models import db, Contract, ContractChange
+from search_cache import ContractRow
+
+CHANGES_PER_PAGE = 500
+MAX_CHANGES_PER_PAGE = 5000
+
+_LOGGED_COLUMNS = ['contract_number', 'contract_name', 'start_date', 'expiration_date', 'value', 'status', 'notes']
+
+def _log_sql(prefix: str, operation: str) -> str:
+    return f"""INSERT INTO contract_change (contract_id, contract_number, operation)
+        VALUES ({prefix}.id, {prefix}.contract_number, '{operation}');"""
+
+# Like the data version and summary triggers, these run inside the writing
+# transaction, so every path that changes contracts is logged atomically with it.
+# Updates that leave every column as it was are not logged.
+CHANGE_LOG_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS contract_change_ai AFTER INSERT ON contract BEGIN
+        {_log_sql('new', 'insert')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contract_change_ad AFTER DELETE ON contract BEGIN
+        {_log_sql('old', 'delete')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contract_change_au AFTER UPDATE ON contract
+        WHEN {' OR '.join(f'old.{column} IS NOT new.{column}' for column in _LOGGED_COLUMNS)}
+    BEGIN
+        {_log_sql('new', 'update')}
+    END""",
+]
+
+def create_change_log_triggers(connection) -> None:
+    """Create the contract triggers that append to contract_change."""
+    for statement in CHANGE_LOG_DDL:
+        connection.execute(text(statement))
+
+def seed_change_log(connection) -> int:
+    """
+    Log an insert for every existing contract, so a sync from the start sees them all.
+
+    Returns:
+        int: Number of changes logged
+    """
+    result = connection.execute(text(
+        """INSERT INTO contract_change (contract_id, contract_number, operation)
+           SELECT id, contract_number, 'insert' FROM contract ORDER BY id"""
+    ))
+    return result.rowcount
+
+def get_changes(since: int = 0, limit: int = CHANGES_PER_PAGE) -> Dict[str, Any]:
+    """
+    Contract changes after the change id `since`, compacted to the latest per contract.
+
+    Each contract appears once, at its most recent change, with its current data
+    (None once deleted). Clients should key contracts by id, since SQLite may give
+    a new contract the id of a deleted one. Changes come in change id order, and
+    the returned cursor is passed back as `since` to continue, so the cost of a
+    sync follows the number of changes rather than the number of contracts. The
+    log and the contract data are read in a single statement, so they agree.
+
+    Args:
+        since (int): Change id the client has synced up to (0 for everything)
+        limit (int): Maximum number of changes to return
+
+    Returns:
+        Dict[str, Any]: 'changes', the 'cursor' to continue from and 'has_more'
+    """
+    later = aliased(ContractChange)
+    superseded = exists().where(and_(later.contract_id == ContractChange.contract_id,
+                                     later.id > ContractChange.id))
+    change_columns = [ContractChange.id.label('change_id'), ContractChange.operation,
+                      ContractChange.contract_id, ContractChange.contract_number.label('logged_number'),
+                      ContractChange.changed_at]
+    query = (
+        select(*change_columns, *contract_columns(EXPORT_FIELDS))
+        .outerjoin(Contract, Contract.id == ContractChange.contract_id)
+        .where(ContractChange.id > since, ~superseded)
+        .order_by(ContractChange.id)
+        .limit(limit + 1)
+    )
+    rows = db.session.execute(query).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changes = []
+    for row in rows:
+        contract = ContractRow(*row[len(change_columns):])
+        changes.append({
+            'change_id': row.change_id,
+            'operation': row.operation,
+            'contract_id': row.contract_id,
+            'contract_number': row.logged_number,
+            'changed_at': row.changed_at.isoformat() if row.changed_at else None,
+            'contract': contract.to_dict() if contract.id is not None else None,
+        })
+    return {
+        'changes': changes,
+        'cursor': rows[-1].change_id if rows else since,
+        'has_more': has_more,
+    }
+
+def latest_change_id() -> int:
+    """Id of the most recent change, a cursor that skips the existing history."""
+    return db.session.execute(select(db.func.max(ContractChange.id))).scalar() or 0
+
+@event.listens_for(Contract.__table__, 'after_create')
+def _create_triggers_after_contract(target, connection, **kw):
+    create_change_log_triggers(connection)
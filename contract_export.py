@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from models import Contract
+from money import money_json
+from storage import read_engine
+
+# Contract columns a caller may ask for, in their default output order
+EXPORT_FIELDS = ['id', 'contract_number', 'contract_name', 'start_date', 'expiration_date',
+                 'value', 'status', 'notes']
+
+STREAM_BATCH_SIZE = 1000
+
+# Byte order mark that makes Excel open UTF-8 CSV files with the right encoding
+UTF8_BOM = '\ufeff'
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    Parse a comma-separated field list, defaulting to every exported field.
+
+    Raises:
+        ValueError: If a field is not an exported Contract column
+    """
+    if not fields:
+        return list(EXPORT_FIELDS)
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in names if name not in EXPORT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    # Keep the caller's order but drop repeats
+    return list(dict.fromkeys(names)) or list(EXPORT_FIELDS)
+
+def contract_columns(fields: Sequence[str]) -> List[Any]:
+    return [getattr(Contract, name) for name in fields]
+
+def iter_rows(query, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[tuple]:
+    """
+    Yield the rows of a column select without loading the whole result.
+
+    Rows are plain tuples fetched from the cursor batch_size at a time, so memory
+    use is bounded by one batch however many contracts match.
+    """
+    # A read-only connection of its own, so a long export holds nothing in the write pool
+    with read_engine().connect() as connection:
+        result = connection.execution_options(yield_per=batch_size).execute(query)
+        for partition in result.partitions():
+            for row in partition:
+                yield tuple(row)
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    return money_json(value)
+
+def _json_record(fields: Sequence[str], row: tuple) -> str:
+    return json.dumps({name: _json_value(value) for name, value in zip(fields, row)},
+                      separators=(',', ':'))
+
+def ndjson_lines(fields: Sequence[str], rows: Iterable[tuple]) -> Iterator[str]:
+    """One JSON object per line (application/x-ndjson)."""
+    for row in rows:
+        yield _json_record(fields, row) + '\n'
+
+def json_array_chunks(fields: Sequence[str], rows: Iterable[tuple],
+                      extra: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """
+    A JSON document {"contracts": [...], ...} produced a record at a time.
+
+    Args:
+        fields (Sequence[str]): Names of the selected columns
+        rows (Iterable[tuple]): Rows from iter_rows
+        extra (dict): Additional top-level keys written after the contracts
+    """
+    yield '{"fields":' + json.dumps(list(fields)) + ',"contracts":['
+    count = 0
+    for row in rows:
+        yield (',' if count else '') + _json_record(fields, row)
+        count += 1
+    trailer = {'count': count, **(extra or {})}
+    yield '],' + json.dumps(trailer)[1:]
+
+def csv_chunks(fields: Sequence[str], rows: Iterable[tuple], bom: bool = False,
+               rows_per_chunk: int = STREAM_BATCH_SIZE) -> Iterator[str]:
+    """
+    CSV text with a header row, yielded rows_per_chunk rows at a time.
+
+    Lines end in CRLF and dates are ISO formatted, which Excel and other
+    spreadsheets read without an import dialog.
+
+    Args:
+        fields (Sequence[str]): Names of the selected columns, used as the header
+        rows (Iterable[tuple]): Rows from iter_rows
+        bom (bool): Start with a UTF-8 byte order mark for Excel
+        rows_per_chunk (int): Rows buffered before each chunk is emitted
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if bom:
+        buffer.write(UTF8_BOM)
+    writer.writerow(fields)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def gzip_chunks(chunks: Iterable[str], level: int = 6) -> Iterator[bytes]:
+    """Encode text chunks as UTF-8 and compress them into a single gzip stream."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
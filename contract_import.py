@@ -0,0 +1,183 @@
+import csv
+import logging
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from sqlalchemy import insert, select
+
+from models import db, Contract
+from money import parse_money
+
+logger = logging.getLogger(__name__)
+
+CONTRACT_STATUSES = ['Active', 'Pending', 'State Contract', 'Expired', 'Terminated']
+REQUIRED_COLUMNS = ['contract_number', 'contract_name', 'value', 'status']
+OPTIONAL_COLUMNS = ['start_date', 'expiration_date', 'notes']
+DATE_FORMATS = ['%Y-%m-%d', '%m/%d/%Y']
+
+IMPORT_CHUNK_SIZE = 1000
+
+_STATUS_LOOKUP = {status.lower(): status for status in CONTRACT_STATUSES}
+
+def _parse_column(values: List[str], parse: Callable[[str], Any]) -> Tuple[List[Any], Dict[int, str]]:
+    """Apply parse to a whole column, collecting errors by row position instead of raising."""
+    parsed, errors = [], {}
+    for position, raw in enumerate(values):
+        try:
+            parsed.append(parse(raw))
+        except ValueError as e:
+            parsed.append(None)
+            errors[position] = str(e)
+    return parsed, errors
+
+def _required_text(raw: str) -> str:
+    if not raw:
+        raise ValueError('is required')
+    return raw
+
+def _optional_text(raw: str) -> Optional[str]:
+    return raw or None
+
+def _value(raw: str) -> Decimal:
+    if not raw:
+        raise ValueError('is required')
+    try:
+        return parse_money(raw)
+    except ValueError:
+        raise ValueError(f'is not a number: {raw!r}')
+
+def _status(raw: str) -> str:
+    status = _STATUS_LOOKUP.get(raw.lower())
+    if status is None:
+        raise ValueError(f"must be one of {', '.join(CONTRACT_STATUSES)}, got {raw!r}")
+    return status
+
+def _date(raw: str):
+    if not raw:
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(raw, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f'is not a date (YYYY-MM-DD or MM/DD/YYYY): {raw!r}')
+
+COLUMN_PARSERS = {
+    'contract_number': _required_text,
+    'contract_name': _required_text,
+    'value': _value,
+    'status': _status,
+    'start_date': _date,
+    'expiration_date': _date,
+    'notes': _optional_text,
+}
+
+def validate_chunk(rows: List[Dict[str, str]]) -> Tuple[List[Dict[str, Any]], Dict[int, List[str]]]:
+    """
+    Validate a chunk of CSV rows column by column.
+
+    Args:
+        rows (List[Dict[str, str]]): Raw rows keyed by column name
+
+    Returns:
+        Tuple: (records with parsed values, errors keyed by row position in the chunk)
+    """
+    records = [{} for _ in rows]
+    errors: Dict[int, List[str]] = {}
+    for name, parse in COLUMN_PARSERS.items():
+        values = [(row.get(name) or '').strip() for row in rows]
+        parsed, column_errors = _parse_column(values, parse)
+        for record, value in zip(records, parsed):
+            record[name] = value
+        for position, message in column_errors.items():
+            errors.setdefault(position, []).append(f'{name} {message}')
+
+    for position, record in enumerate(records):
+        start, end = record['start_date'], record['expiration_date']
+        if start and end and end < start:
+            errors.setdefault(position, []).append('expiration_date is before start_date')
+    return records, errors
+
+def _existing_numbers(numbers: Iterable[str]) -> set:
+    """Contract numbers among `numbers` already in the database, in one query."""
+    numbers = list(numbers)
+    if not numbers:
+        return set()
+    return set(db.session.scalars(
+        select(Contract.contract_number).where(Contract.contract_number.in_(numbers))
+    ))
+
+def import_contracts_csv(stream: TextIO, chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Import contracts from CSV text, validating and inserting them a chunk at a time.
+
+    Each chunk is validated column by column and checked against the database for
+    existing contract numbers with a single query. The valid rows are then written
+    with one multi-row INSERT. Invalid and duplicate rows are reported and skipped
+    without stopping the import. All chunks are committed together at the end.
+
+    Args:
+        stream (TextIO): CSV text whose header names the Contract columns
+        chunk_size (int): Rows validated and inserted together
+
+    Returns:
+        Dict[str, Any]: Counts of rows read and inserted, and one entry per rejected
+        row with its line number, contract number and error messages
+
+    Raises:
+        ValueError: If the header lacks a required column
+    """
+    reader = csv.DictReader(stream)
+    missing = [name for name in REQUIRED_COLUMNS if name not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+    summary = {'rows': 0, 'inserted': 0, 'errors': []}
+    seen: Dict[str, int] = {}  # contract number -> line it was first read from
+
+    def numbered_rows():
+        for row in reader:
+            yield reader.line_num, row
+
+    rows = numbered_rows()
+    try:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            summary['rows'] += len(chunk)
+            lines = [line for line, _ in chunk]
+            records, errors = validate_chunk([row for _, row in chunk])
+
+            candidates = {record['contract_number'] for position, record in enumerate(records)
+                          if position not in errors}
+            existing = _existing_numbers(candidates)
+
+            valid = []
+            for position, record in enumerate(records):
+                number = record['contract_number']
+                if position not in errors and number:
+                    if number in seen:
+                        errors[position] = [f'contract_number duplicates line {seen[number]}']
+                    elif number in existing:
+                        errors[position] = ['contract_number already exists in the database']
+                if position in errors:
+                    summary['errors'].append({'line': lines[position], 'contract_number': number,
+                                              'errors': errors[position]})
+                    continue
+                seen[number] = lines[position]
+                valid.append(record)
+
+            if valid:
+                db.session.execute(insert(Contract), valid)
+                summary['inserted'] += len(valid)
+            logger.info(f"Imported chunk of {len(chunk)} rows: {len(valid)} valid, {len(chunk) - len(valid)} rejected")
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    logger.info(f"CSV import finished: {summary['inserted']} of {summary['rows']} rows inserted")
+    return summary
@@ -0,0 +1,51 @@
+from typing import NamedTuple
+
+from sqlalchemy import event, select, text
+
+from models import db, Contract, DataVersion
+
+# Triggers fire inside the writing transaction, so every path that changes
+# contracts (ORM, bulk upserts, raw SQL) bumps the version atomically with it
+DATA_VERSION_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS contract_version_{name} AFTER {operation} ON contract BEGIN
+        UPDATE data_version SET version = version + 1, modified_at = CURRENT_TIMESTAMP WHERE id = 1;
+    END"""
+    for name, operation in (('ai', 'INSERT'), ('au', 'UPDATE'), ('ad', 'DELETE'))
+]
+
+def create_data_version_triggers(connection) -> None:
+    """Create the contract triggers that bump the data version."""
+    for statement in DATA_VERSION_DDL:
+        connection.execute(text(statement))
+
+NEW_EPOCH_SQL = 'lower(hex(randomblob(16)))'
+
+class DataStamp(NamedTuple):
+    """
+    Identifies a state of the contract data.
+
+    The version restarts at 0 when the database is recreated (reset_db.py), so it
+    is only meaningful together with the database's random epoch.
+    """
+    epoch: str
+    version: int
+
+def seed_data_version(connection) -> None:
+    """Insert the single data_version row, with a new epoch, if it is missing."""
+    connection.execute(text(
+        "INSERT OR IGNORE INTO data_version (id, version, modified_at, epoch) "
+        f"VALUES (1, 0, CURRENT_TIMESTAMP, {NEW_EPOCH_SQL})"
+    ))
+
+def get_data_stamp() -> DataStamp:
+    """Current data stamp; changes whenever any contract is added, edited, deleted or imported."""
+    row = db.session.execute(select(DataVersion.epoch, DataVersion.version).where(DataVersion.id == 1)).first()
+    return DataStamp(row.epoch or '', row.version) if row else DataStamp('', 0)
+
+@event.listens_for(Contract.__table__, 'after_create')
+def _create_triggers_after_contract(target, connection, **kw):
+    create_data_version_triggers(connection)
+
+@event.listens_for(DataVersion.__table__, 'after_create')
+def _seed_after_data_version(target, connection, **kw):
+    seed_data_version(connection)
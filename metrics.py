@@ -0,0 +1,190 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from flask import Response, current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and histograms rendered in the Prometheus text format.
+
+    Values live in this process only; each worker of a multi-process deployment
+    exposes its own.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.help: Dict[str, Tuple[str, str]] = {}  # name -> (type, help text)
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, List[float]]] = {}  # bucket counts + [sum, count]
+        self.buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def counter(self, name: str, help_text: str) -> None:
+        self.help.setdefault(name, ('counter', help_text))
+        self.counters.setdefault(name, {})
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.help.setdefault(name, ('histogram', help_text))
+        self.histograms.setdefault(name, {})
+        self.buckets.setdefault(name, buckets)
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        key = _labels(labels)
+        with self.lock:
+            series = self.counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _labels(labels)
+        buckets = self.buckets[name]
+        with self.lock:
+            series = self.histograms[name]
+            counts = series.get(key)
+            if counts is None:
+                counts = series[key] = [0] * len(buckets) + [0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def render(self) -> str:
+        lines = []
+        with self.lock:
+            for name, (kind, help_text) in self.help.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                if kind == 'counter':
+                    for labels, value in self.counters[name].items():
+                        lines.append(f'{name}{_format_labels(labels)} {value}')
+                    continue
+                buckets = self.buckets[name]
+                for labels, counts in self.histograms[name].items():
+                    for bound, count in zip(buckets, counts):
+                        lines.append(f'{name}_bucket{_format_labels(labels, ("le", repr(bound)))} {count}')
+                    lines.append(f'{name}_bucket{_format_labels(labels, ("le", "+Inf"))} {counts[-1]}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {counts[-2]}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {counts[-1]}')
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+REGISTRY.counter('http_requests_total', 'HTTP requests by endpoint, method and status')
+REGISTRY.histogram('http_request_duration_seconds', 'HTTP request duration by endpoint')
+REGISTRY.counter('db_queries_total', 'SQL statements executed')
+REGISTRY.histogram('db_query_duration_seconds', 'SQL statement duration')
+REGISTRY.counter('db_slow_queries_total', 'SQL statements slower than SLOW_QUERY_THRESHOLD_MS')
+REGISTRY.histogram('span_duration_seconds', 'Duration of instrumented application phases',
+                   buckets=DEFAULT_BUCKETS + (30.0, 60.0))
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time a phase of work, such as PDF parsing or report layout.
+
+    The duration is recorded in span_duration_seconds and, inside a request, added
+    to that request's Server-Timing header.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        REGISTRY.observe('span_duration_seconds', elapsed, span=name)
+        if has_request_context():
+            g.setdefault('metrics_spans', []).append((name, elapsed))
+
+class Metrics:
+    """
+    Request and query instrumentation for the Flask app.
+
+    Every request is timed and counted by endpoint. Every SQL statement run by
+    any engine is timed, counted towards the current request, and logged when
+    slower than SLOW_QUERY_THRESHOLD_MS. With METRICS_RESPONSE_HEADERS enabled,
+    responses carry X-Query-Count and a Server-Timing breakdown.
+    """
+
+    def __init__(self, app=None, registry: MetricsRegistry = REGISTRY):
+        self.registry = registry
+        self.slow_query_threshold = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault('SLOW_QUERY_THRESHOLD_MS', 200)
+        app.config.setdefault('METRICS_RESPONSE_HEADERS', False)
+        self.slow_query_threshold = app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        if not event.contains(Engine, 'before_cursor_execute', self._before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        app.extensions['metrics'] = self
+
+    def render(self) -> Response:
+        return Response(self.registry.render(), mimetype='text/plain; version=0.0.4')
+
+    def _before_request(self) -> None:
+        g.metrics_start = time.perf_counter()
+        g.metrics_queries = 0
+        g.metrics_query_time = 0.0
+
+    def _after_request(self, response):
+        start = g.get('metrics_start')
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or 'unmatched'
+        self.registry.inc('http_requests_total', endpoint=endpoint, method=request.method,
+                          status=response.status_code)
+        self.registry.observe('http_request_duration_seconds', elapsed, endpoint=endpoint)
+
+        if current_app.config['METRICS_RESPONSE_HEADERS']:
+            # Streamed responses are timed up to the first byte only
+            timings = [f'app;dur={elapsed * 1000:.1f}',
+                       f'db;dur={g.metrics_query_time * 1000:.1f};desc="{g.metrics_queries} queries"']
+            timings += [f'{name};dur={duration * 1000:.1f}' for name, duration in g.get('metrics_spans', [])]
+            response.headers['X-Query-Count'] = str(g.metrics_queries)
+            response.headers['Server-Timing'] = ', '.join(timings)
+        return response
+
+    # The start time lives on the statement's execution context, so a statement that
+    # fails (and never reaches after_cursor_execute) leaves nothing behind
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.metrics_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, 'metrics_query_start', None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        self.registry.inc('db_queries_total')
+        self.registry.observe('db_query_duration_seconds', elapsed)
+        if has_request_context() and 'metrics_queries' in g:
+            g.metrics_queries += 1
+            g.metrics_query_time += elapsed
+        threshold = (current_app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000 if has_app_context()
+                     else self.slow_query_threshold)  # the last app's setting outside any app
+        if elapsed >= threshold:
+            self.registry.inc('db_slow_queries_total')
+            logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {' '.join(statement.split())}")
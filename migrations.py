@@ -0,0 +1,238 @@
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Callable, List, Tuple
+
+from sqlalchemy import inspect, select
+from sqlalchemy.schema import CreateTable
+
+from analytics import create_summary_triggers, drop_summary_triggers, rebuild_summary
+from change_log import create_change_log_triggers, seed_change_log
+from data_version import NEW_EPOCH_SQL, create_data_version_triggers, seed_data_version
+from models import db, Contract, ContractChange, ContractSummary, DataVersion, ImportedFile, ImportedPage
+from pagination import segments_after
+from search_index import create_fts_index
+
+logger = logging.getLogger(__name__)
+
+# (version, description, function) in the order they are applied
+MIGRATIONS: List[Tuple[int, str, Callable]] = []
+
+def migration(version: int, description: str):
+    """Register a schema migration. Versions must be unique and increasing."""
+    def decorator(func):
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f'Migration {version} registered out of order')
+        MIGRATIONS.append((version, description, func))
+        return func
+    return decorator
+
+def latest_version() -> int:
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+def get_version(connection) -> int:
+    """Schema version of the database, stored in SQLite's user_version header field."""
+    return connection.exec_driver_sql('PRAGMA user_version').scalar()
+
+def _set_version(connection, version: int) -> None:
+    connection.exec_driver_sql(f'PRAGMA user_version = {int(version)}')
+
+def upgrade(engine) -> int:
+    """
+    Bring the database schema up to the latest version without dropping data.
+
+    A database without a contract table is created from the models and stamped with
+    the latest version. Existing databases run each pending migration in its own
+    transaction; databases created by a bare db.create_all() start at version 1.
+
+    Args:
+        engine: SQLAlchemy engine for the contracts database
+
+    Returns:
+        int: The schema version after upgrading
+    """
+    # pysqlite only opens transactions implicitly for DML, so DDL is wrapped by hand
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+        try:
+            if not inspect(connection).has_table(Contract.__tablename__):
+                logger.info("Creating database schema")
+                db.metadata.create_all(connection)
+                _set_version(connection, latest_version())
+                connection.exec_driver_sql('COMMIT')
+                return latest_version()
+            version = get_version(connection) or 1
+            connection.exec_driver_sql('COMMIT')
+        except Exception:
+            connection.exec_driver_sql('ROLLBACK')
+            raise
+
+        for target, description, func in MIGRATIONS:
+            if target <= version:
+                continue
+            connection.exec_driver_sql('BEGIN IMMEDIATE')
+            try:
+                # Another process may have migrated while we waited for the lock
+                if get_version(connection) >= target:
+                    connection.exec_driver_sql('COMMIT')
+                    continue
+                logger.info(f"Applying migration {target}: {description}")
+                func(connection)
+                _set_version(connection, target)
+                connection.exec_driver_sql('COMMIT')
+            except Exception:
+                connection.exec_driver_sql('ROLLBACK')
+                logger.error(f"Migration {target} failed, database left at version {version}")
+                raise
+            version = target
+        return version
+
+def rebuild_table(connection, table, column_expressions=None) -> None:
+    """
+    Recreate `table` from its current model definition, keeping its rows.
+
+    SQLite cannot alter column types or constraints in place, so the table is copied
+    into a new table with the model's definition, swapped in, and its indexes and
+    after_create hooks (triggers, full-text index) are re-applied.
+
+    Args:
+        connection: Connection inside the migration's transaction
+        table: Model table to rebuild
+        column_expressions (dict): SQL expressions computing new column values from
+            the old row, keyed by column name (default: copy the column unchanged)
+    """
+    column_expressions = column_expressions or {}
+    existing = {column['name'] for column in inspect(connection).get_columns(table.name)}
+    temporary = f'_{table.name}_rebuild'
+
+    create = str(CreateTable(table).compile(dialect=connection.dialect))
+    connection.exec_driver_sql(create.replace(f'TABLE {table.name} ', f'TABLE {temporary} ', 1))
+
+    names, values = [], []
+    for column in table.columns:
+        if column.name in column_expressions:
+            names.append(column.name)
+            values.append(column_expressions[column.name])
+        elif column.name in existing:
+            names.append(column.name)
+            values.append(column.name)
+    connection.exec_driver_sql(
+        f'INSERT INTO {temporary} ({", ".join(names)}) SELECT {", ".join(values)} FROM {table.name}'
+    )
+    connection.exec_driver_sql(f'DROP TABLE {table.name}')
+    connection.exec_driver_sql(f'ALTER TABLE {temporary} RENAME TO {table.name}')
+    for index in table.indexes:
+        index.create(connection)
+    table.dispatch.after_create(table, connection, checkfirst=False, _ddl_runner=None)
+
+def _create_indexes(connection, table, names) -> None:
+    for index in table.indexes:
+        if index.name in names:
+            index.create(connection, checkfirst=True)
+
+@migration(1, 'Initial schema created by db.create_all()')
+def _initial_schema(connection):
+    pass
+
+@migration(2, 'Add full-text search index')
+def _add_full_text_index(connection):
+    create_fts_index(connection)
+
+@migration(3, 'Add indexes for contract sort and filter columns')
+def _add_sort_indexes(connection):
+    _create_indexes(connection, Contract.__table__, [
+        'ix_contract_contract_name_id',
+        'ix_contract_start_date_id',
+        'ix_contract_expiration_date_id',
+        'ix_contract_value_id',
+        'ix_contract_status_id',
+        'ix_contract_status_expiration_date',
+    ])
+
+@migration(4, 'Add PDF import fingerprint tables')
+def _add_import_fingerprints(connection):
+    ImportedFile.__table__.create(connection, checkfirst=True)
+    ImportedPage.__table__.create(connection, checkfirst=True)
+
+@migration(5, 'Add data version stamp maintained by contract triggers')
+def _add_data_version(connection):
+    DataVersion.__table__.create(connection, checkfirst=True)
+    seed_data_version(connection)
+    create_data_version_triggers(connection)
+
+@migration(6, 'Add contract summary table maintained by contract triggers')
+def _add_contract_summary(connection):
+    ContractSummary.__table__.create(connection, checkfirst=True)
+    rebuild_summary(connection)
+    create_summary_triggers(connection)
+
+@migration(7, 'Store contract values as integer cents')
+def _store_values_as_cents(connection):
+    # The summary is derived data: it is recreated empty, and recomputed once the
+    # contract table (whose rebuild restores the summary triggers) holds cents
+    drop_summary_triggers(connection)
+    ContractSummary.__table__.drop(connection)
+    ContractSummary.__table__.create(connection)
+    rebuild_table(connection, Contract.__table__, {'value': 'CAST(ROUND(value * 100) AS INTEGER)'})
+    rebuild_summary(connection)
+
+@migration(8, 'Add contract change log maintained by contract triggers')
+def _add_change_log(connection):
+    ContractChange.__table__.create(connection, checkfirst=True)
+    seed_change_log(connection)
+    create_change_log_triggers(connection)
+
+@migration(9, 'Add a random epoch to the data version stamp')
+def _add_data_epoch(connection):
+    connection.exec_driver_sql('ALTER TABLE data_version ADD COLUMN epoch VARCHAR(32)')
+    connection.exec_driver_sql(f'UPDATE data_version SET epoch = {NEW_EPOCH_SQL}')
+
+# Cursor positions used to exercise the keyset seeks, by column type
+_SAMPLE_VALUES = {str: 'M', float: 1000.0, Decimal: Decimal('1000.00'), date: date(2025, 1, 1)}
+
+def check_query_plans(connection, sort_fields: List[str]) -> List[str]:
+    """
+    Verify with EXPLAIN QUERY PLAN that contract listings are served by an index.
+
+    Covers the first page and every keyset seek of each sort field in both
+    directions, the active-contract filter used by the reports and the value
+    range filter.
+
+    Args:
+        connection: Connection to a migrated contracts database
+        sort_fields (List[str]): Sortable Contract columns offered by the views
+
+    Returns:
+        List[str]: One message per query that scans the table or sorts in a temp b-tree
+    """
+    queries = []
+    for field in sort_fields:
+        column = getattr(Contract, field)
+        for descending in (False, True):
+            if descending:
+                ordered = select(Contract.id).order_by(column.desc(), Contract.id.desc()).limit(51)
+            else:
+                ordered = select(Contract.id).order_by(column.asc(), Contract.id.asc()).limit(51)
+            direction = 'desc' if descending else 'asc'
+            queries.append((f'sort by {field} {direction}', ordered))
+            for value in (None, _SAMPLE_VALUES[column.type.python_type]):
+                for n, criterion in enumerate(segments_after(column, Contract.id, value, 1, descending)):
+                    queries.append((f'sort by {field} {direction} from {value!r} (segment {n + 1})',
+                                    ordered.where(criterion)))
+        if field == 'expiration_date':
+            queries.append((f'active contracts by {field}',
+                            select(Contract.id).where(Contract.status == 'Active').order_by(column)))
+        if field == 'value':
+            low, high = _SAMPLE_VALUES[Decimal], _SAMPLE_VALUES[Decimal] * 100
+            queries.append((f'contracts with {field} between {low} and {high}',
+                            select(Contract.id).where(column >= low, column <= high)
+                            .order_by(column.asc(), Contract.id.asc()).limit(51)))
+
+    failures = []
+    for label, query in queries:
+        compiled = query.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True})
+        plan = [row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}')]
+        uses_index = any('INDEX' in step or 'PRIMARY KEY' in step for step in plan)
+        if not uses_index or any('TEMP B-TREE' in step for step in plan):
+            failures.append(f'{label}: {"; ".join(plan)}')
+    return failures
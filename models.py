@@ -1,6 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 
+from money import Money
+
 db = SQLAlchemy()
 
 class Contract(db.Model):
@@ -11,9 +13,98 @@ class Contract(db.Model):
     contract_name = db.Column(db.String(100), nullable=False)
     start_date = db.Column(db.Date, nullable=True)
     expiration_date = db.Column(db.Date, nullable=True)
-    value = db.Column(db.Float, nullable=False)
+    value = db.Column(Money, nullable=False)  # integer cents, Decimal in Python
     status = db.Column(db.String(20), nullable=False)
     notes = db.Column(db.Text, nullable=True)
 
+    # Every sortable column is indexed together with id, the keyset pagination tie-breaker
+    __table_args__ = (
+        db.Index('ix_contract_contract_name_id', 'contract_name', 'id'),
+        db.Index('ix_contract_start_date_id', 'start_date', 'id'),
+        db.Index('ix_contract_expiration_date_id', 'expiration_date', 'id'),
+        db.Index('ix_contract_value_id', 'value', 'id'),
+        db.Index('ix_contract_status_id', 'status', 'id'),
+        db.Index('ix_contract_status_expiration_date', 'status', 'expiration_date'),
+    )
+
     def __repr__(self):
         return f'<Contract {self.contract_number}: {self.contract_name}>'
+
+class ImportedFile(db.Model):
+    """Fingerprint of a contract PDF as of its last import."""
+    __tablename__ = 'imported_file'
+
+    id = db.Column(db.Integer, primary_key=True)
+    source_path = db.Column(db.String(255), unique=True, nullable=False)
+    file_hash = db.Column(db.String(64), nullable=False)
+    page_count = db.Column(db.Integer, nullable=False)
+    imported_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ImportedFile {self.source_path}: {self.file_hash[:12]}>'
+
+class ImportedPage(db.Model):
+    """Fingerprint of one page of an imported PDF and the contracts that start on it."""
+    __tablename__ = 'imported_page'
+
+    id = db.Column(db.Integer, primary_key=True)
+    file_id = db.Column(db.Integer, db.ForeignKey('imported_file.id'), nullable=False)
+    page_number = db.Column(db.Integer, nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    contract_numbers = db.Column(db.Text, nullable=False, default='')  # comma-separated
+
+    __table_args__ = (
+        db.UniqueConstraint('file_id', 'page_number', name='uq_imported_page_file_page'),
+    )
+
+    def __repr__(self):
+        return f'<ImportedPage {self.file_id}#{self.page_number}: {self.content_hash[:12]}>'
+
+class DataVersion(db.Model):
+    """Single-row stamp bumped by database triggers whenever any contract changes."""
+    __tablename__ = 'data_version'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    modified_at = db.Column(db.DateTime, nullable=True)
+    # Random per database, so a recreated database never reuses an earlier version
+    epoch = db.Column(db.String(32), nullable=True)
+
+    def __repr__(self):
+        return f'<DataVersion {self.epoch}:{self.version}>'
+
+class ContractSummary(db.Model):
+    """Contract count and total value per status and expiration day, kept current by triggers."""
+    __tablename__ = 'contract_summary'
+
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), nullable=False)
+    expiration_day = db.Column(db.String(10), nullable=False, default='')  # ISO date, '' when none
+    contract_count = db.Column(db.Integer, nullable=False, default=0)
+    total_value = db.Column(Money, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('status', 'expiration_day', name='uq_contract_summary_status_day'),
+        db.Index('ix_contract_summary_expiration_day', 'expiration_day'),
+    )
+
+    def __repr__(self):
+        return f'<ContractSummary {self.status} {self.expiration_day or "-"}: {self.contract_count}>'
+
+class ContractChange(db.Model):
+    """Append-only log of contract inserts, updates and deletes, written by triggers."""
+    __tablename__ = 'contract_change'
+
+    id = db.Column(db.Integer, primary_key=True)  # never reused within a database (restarts if it is recreated)
+    contract_id = db.Column(db.Integer, nullable=False)
+    contract_number = db.Column(db.String(50), nullable=False)
+    operation = db.Column(db.String(6), nullable=False)  # 'insert', 'update' or 'delete'
+    changed_at = db.Column(db.DateTime, nullable=False, server_default=db.func.current_timestamp())
+
+    __table_args__ = (
+        db.Index('ix_contract_change_contract_id_id', 'contract_id', 'id'),
+        {'sqlite_autoincrement': True},
+    )
+
+    def __repr__(self):
+        return f'<ContractChange #{self.id} {self.operation} {self.contract_number}>'
@@ -0,0 +1,61 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any, Union
+
+from sqlalchemy.types import Integer, TypeDecorator
+
+CENT = Decimal('0.01')
+MAX_CENTS = 2 ** 63 - 1  # SQLite INTEGER range
+
+def to_money(value: Union[Decimal, float, int, str]) -> Decimal:
+    """
+    Round an amount to whole cents.
+
+    Floats are converted through their shortest repr, so 0.1 is ten cents rather
+    than the binary fraction just below it.
+
+    Raises:
+        ValueError: If the amount is not a finite number or is out of range
+    """
+    if isinstance(value, float):
+        value = repr(value)
+    try:
+        amount = Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, TypeError):
+        raise ValueError(f'Invalid amount: {value!r}')
+    if not amount.is_finite():  # NaN and infinities survive quantize()
+        raise ValueError(f'Invalid amount: {value!r}')
+    if abs(amount) * 100 > MAX_CENTS:
+        raise ValueError(f'Amount out of range: {value!r}')
+    return amount
+
+def parse_money(text: str) -> Decimal:
+    """Parse an amount as typed by a user or found in a CSV, e.g. '$1,250,000.00'."""
+    return to_money(text.replace('$', '').replace(',', '').strip())
+
+def money_json(value: Any) -> Any:
+    """JSON-friendly amount: a number with at most two decimals, exact to the cent."""
+    return float(value) if isinstance(value, Decimal) else value
+
+class Money(TypeDecorator):
+    """
+    Amount of money stored as an integer number of cents.
+
+    Comparisons and SUM() run on exact integers in SQL; Python sees Decimal values
+    with two decimal places. Binds accept Decimal, int, float or numeric strings.
+    """
+    impl = Integer
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return Decimal
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(to_money(value).scaleb(2))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(round(value)).scaleb(-2)
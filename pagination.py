@@ -0,0 +1,155 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import and_
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated listing."""
+    items: List[Any]
+    per_page: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+def encode_cursor(value: Any, row_id: int, direction: str = 'next') -> str:
+    """Encode a (sort value, id) position as an opaque, URL-safe cursor."""
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    elif value is not None and not isinstance(value, (int, float, str)):
+        value = str(value)
+    payload = json.dumps({'d': direction, 'v': value, 'id': row_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str, column) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Returns:
+        tuple: (direction, sort value converted to the column's Python type, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction, value, row_id = payload['d'], payload['v'], int(payload['id'])
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+    if direction not in ('next', 'prev'):
+        raise ValueError(f'Invalid cursor direction: {direction}')
+
+    if value is not None:
+        python_type = column.type.python_type
+        try:
+            if python_type is date:
+                value = date.fromisoformat(value)
+            elif python_type is datetime:
+                value = datetime.fromisoformat(value)
+            else:
+                value = python_type(value)
+        except (ValueError, TypeError, ArithmeticError) as e:
+            raise ValueError(f'Invalid cursor value: {value}') from e
+
+    return direction, value, row_id
+
+def segments_after(column, id_column, value, row_id, descending):
+    """
+    Build the criteria selecting rows that follow (value, row_id) in the listing order.
+
+    SQLite sorts NULLs first in ascending order and last in descending order. Rather
+    than one OR-ed predicate, which forces a scan from the start of the index, the
+    remainder of the listing is split into segments that are each a simple index range
+    and are queried in order until the page is full.
+    """
+    if descending:
+        if value is None:
+            return [and_(column.is_(None), id_column < row_id)]
+        return [
+            and_(column <= value, (column < value) | (id_column < row_id)),
+            column.is_(None),
+        ]
+    if value is None:
+        return [and_(column.is_(None), id_column > row_id), column.isnot(None)]
+    return [and_(column >= value, (column > value) | (id_column > row_id))]
+
+def keyset_paginate(
+    query,
+    column,
+    id_column,
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    per_page: int = 50,
+    key: Optional[Callable[[Any], Any]] = None
+) -> Page:
+    """
+    Fetch one page of `query` ordered by (column, id_column) without using OFFSET.
+
+    Args:
+        query: Unordered query (ORM Query or Select) to paginate
+        column: Column the listing is sorted by
+        id_column: Unique tie-breaker column
+        descending (bool): Sort direction of the listing
+        cursor (str): Cursor from a previous page, or None for the first page
+        per_page (int): Maximum number of rows per page
+        key (callable): Extracts (sort value, id) from a row (default: attribute lookup)
+
+    Returns:
+        Page: The rows of the page with cursors to its neighbours
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if key is None:
+        key = lambda row: (getattr(row, column.key), getattr(row, id_column.key))
+
+    direction, value, row_id = 'next', None, None
+    if cursor:
+        direction, value, row_id = decode_cursor(cursor, column)
+
+    # Walking backwards is a forward walk over the reversed ordering
+    backwards = direction == 'prev'
+    walk_descending = descending != backwards
+    if walk_descending:
+        ordered = query.order_by(column.desc(), id_column.desc())
+    else:
+        ordered = query.order_by(column.asc(), id_column.asc())
+
+    limit = per_page + 1
+    if cursor:
+        rows = []
+        for criterion in segments_after(column, id_column, value, row_id, walk_descending):
+            rows.extend(_fetch(ordered.filter(criterion), limit - len(rows)))
+            if len(rows) >= limit:
+                break
+    else:
+        rows = _fetch(ordered, limit)
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    page = Page(items=rows, per_page=per_page)
+    if rows:
+        first, last = key(rows[0]), key(rows[-1])
+        if backwards:
+            page.next_cursor = encode_cursor(*last)
+            page.prev_cursor = encode_cursor(*first, direction='prev') if has_more else None
+        else:
+            page.next_cursor = encode_cursor(*last) if has_more else None
+            page.prev_cursor = encode_cursor(*first, direction='prev') if cursor else None
+    return page
+
+def _fetch(query, limit):
+    """Run `query` with a LIMIT for either an ORM Query or a Core Select."""
+    limited = query.limit(limit)
+    if hasattr(limited, 'all'):
+        return limited.all()
+    from models import db
+    return db.session.execute(limited).all()
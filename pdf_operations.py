@@ -5,13 +5,28 @@ from reportlab.lib.pagesizes import letter, landscape
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from models import Contract, db
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfgen import canvas
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from pdfminer.pdftypes import resolve1
+from models import Contract, ImportedFile, ImportedPage, db
+from metrics import span
+from money import to_money
+import hashlib
 import logging
+import math
+import os
 import re
+from decimal import Decimal
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ZERO_VALUE = Decimal('0.00')  # amount of contracts not awarded yet
+
 def clean_text(text):
     """Clean and normalize text."""
     return ' '.join(text.split()).strip()
@@ -34,9 +49,9 @@ def parse_date(text):
     return None
 
 def parse_value(text):
-    """Parse monetary value from text."""
+    """Parse monetary value from text, rounded to whole cents."""
     if not text or any(word in text.lower() for word in ['no', 'not', 'award', 'awarded', 'yet', 'available']):
-        return 0.0
+        return ZERO_VALUE
         
     # Remove currency symbols, commas, and whitespace
     text = text.replace('$', '').replace(',', '').strip()
@@ -45,248 +60,762 @@ def parse_value(text):
     matches = re.findall(r'\d+\.?\d*', text)
     if matches:
         try:
-            return float(matches[0])
-        except (ValueError, TypeError):
-            return 0.0
-    return 0.0
+            return to_money(matches[0])
+        except ValueError:
+            return ZERO_VALUE
+    return ZERO_VALUE
 
-def extract_pdf_data(pdf_path):
-    """Extract contract data from PDF and store in database."""
-    try:
-        logger.info(f"Opening PDF file: {pdf_path}")
-        with pdfplumber.open(pdf_path) as pdf:
-            logger.info(f"Successfully opened PDF with {len(pdf.pages)} pages")
-            
-            for page_num, page in enumerate(pdf.pages):
-                text = page.extract_text()
-                logger.info(f"\nRaw text from page {page_num + 1}:")
-                logger.info(text)
-                
-                lines = text.split('\n')
-                current_contract = None
-                
-                for line in lines:
-                    line = clean_text(line)
-                    logger.info(f"Processing line: {line}")
-                    
-                    # Skip header line and empty lines
-                    if not line or line.startswith('#') or 'Contract Date Expiration Amount' in line:
-                        continue
-                        
-                    # Try to parse contract data from the line
-                    parts = line.split()
-                    if len(parts) >= 4:  # We need at least contract number, dates, and amount
-                        try:
-                            # Extract contract number (first part is usually a number)
-                            if parts[0].isdigit():
-                                if current_contract:
-                                    # Save previous contract if exists
-                                    if current_contract.value is None:
-                                        current_contract.value = 0.0
-                                    db.session.add(current_contract)
-                                    db.session.commit()
-                                    logger.info(f"Successfully added contract: {current_contract.contract_name}")
-                                
-                                # Start new contract
-                                current_contract = Contract()
-                                current_contract.contract_name = ""
-                                current_contract.value = 0.0  # Default value
-                                contract_parts = []
-                                amount_found = False
-                                
-                                # Process each part
-                                for part in parts[1:]:  # Skip the contract number
-                                    # Check if this part is a date
-                                    date = parse_date(part)
-                                    if date:
-                                        if not current_contract.start_date:
-                                            current_contract.start_date = date
-                                        elif not current_contract.expiration_date:
-                                            current_contract.expiration_date = date
-                                        continue
-                                    
-                                    # Check if this part is an amount (handle special cases)
-                                    if (part.startswith('$') or 
-                                        part.replace(',', '').replace('.', '').isdigit()) and not amount_found:
-                                        value = parse_value(part)
-                                        current_contract.value = value if value is not None else 0.0
-                                        amount_found = True
-                                        continue
-                                    
-                                    # Handle special cases for amount
-                                    if part.lower() in ['no', 'not', 'award', 'awarded', 'yet', 'available']:
-                                        continue
-                                    
-                                    # If not date or amount, it's part of the contract name
-                                    contract_parts.append(part)
-                                
-                                current_contract.contract_name = ' '.join(contract_parts)
-                                current_contract.status = 'Active'
-                                current_contract.contract_number = parts[0]
-                        
-                        except Exception as e:
-                            logger.error(f"Error processing line: {line}")
-                            logger.error(str(e))
+# Token kinds produced by classify_token
+TOKEN_DATE = 'date'
+TOKEN_AMOUNT = 'amount'
+TOKEN_NO_AWARD = 'no_award'
+TOKEN_TEXT = 'text'
+
+NO_AWARD_MARKERS = frozenset(['no', 'not', 'award', 'awarded', 'yet', 'available'])
+CONTINUATION_STOP_WORDS = frozenset(['yet', 'awarded', 'available'])
+
+# Every whitespace-free string parse_date accepts has this shape; anything else
+# is rejected without trying the strptime formats
+DATE_TOKEN_RE = re.compile(r'\d{1,4}[-/]\d{1,2}[-/]\d{1,4}')
+AMOUNT_TOKEN_RE = re.compile(r'\$|[\d,.]*\d[\d,.]*$')
+
+@lru_cache(maxsize=8192)
+def classify_token(token):
+    """
+    Classify one whitespace-free token of a contract line in a single pass.
+
+    Results are memoized, since the same dates and amounts recur across lines.
+
+    Returns:
+        tuple: (TOKEN_DATE, datetime), (TOKEN_AMOUNT, Decimal), (TOKEN_NO_AWARD, None)
+        or (TOKEN_TEXT, None), matching what parse_date/parse_value would decide
+    """
+    if DATE_TOKEN_RE.fullmatch(token):
+        date = parse_date(token)
+        if date:
+            return TOKEN_DATE, date
+    if AMOUNT_TOKEN_RE.match(token):
+        return TOKEN_AMOUNT, parse_value(token)
+    if token.lower() in NO_AWARD_MARKERS:
+        return TOKEN_NO_AWARD, None
+    return TOKEN_TEXT, None
+
+# Columns filled from the PDF; status and notes are only set when a contract is first imported
+IMPORTED_FIELDS = ['contract_name', 'start_date', 'expiration_date', 'value']
+
+def new_contract_record(contract_number):
+    """Plain record for a contract parsed from the PDF, before it is written to the database."""
+    return {
+        'contract_number': contract_number,
+        'contract_name': '',
+        'start_date': None,
+        'expiration_date': None,
+        'value': ZERO_VALUE,
+        'status': 'Active',
+        'notes': None,
+    }
+
+def parse_page_text(text):
+    """
+    Parse the contract records from the text of one PDF page.
+
+    Returns:
+        tuple: (leading continuation lines that belong to the last contract of the
+        previous page, list of contract records started on this page)
+    """
+    leading_lines = []
+    records = []
+    current_contract = None
+
+    for line in text.split('\n'):
+        line = clean_text(line)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Processing line: {line}")
+
+        # Skip header line and empty lines
+        if not line or line.startswith('#') or 'Contract Date Expiration Amount' in line:
+            continue
+
+        # Try to parse contract data from the line
+        parts = line.split()
+        if len(parts) >= 4:  # We need at least contract number, dates, and amount
+            try:
+                # Extract contract number (first part is usually a number)
+                if parts[0].isdigit():
+                    # Start new contract
+                    current_contract = new_contract_record(parts[0])
+                    records.append(current_contract)
+                    contract_parts = []
+                    amount_found = False
+
+                    # Process each part
+                    for part in parts[1:]:  # Skip the contract number
+                        kind, value = classify_token(part)
+
+                        # Check if this part is a date
+                        if kind == TOKEN_DATE:
+                            if not current_contract['start_date']:
+                                current_contract['start_date'] = value.date()
+                            elif not current_contract['expiration_date']:
+                                current_contract['expiration_date'] = value.date()
+                            continue
+
+                        # Check if this part is an amount (only the first one counts)
+                        if kind == TOKEN_AMOUNT and not amount_found:
+                            current_contract['value'] = value if value is not None else ZERO_VALUE
+                            amount_found = True
+                            continue
+
+                        # Handle special cases for amount
+                        if kind == TOKEN_NO_AWARD:
                             continue
-                    
-                    # Handle continuation lines (additional contract name parts)
-                    elif current_contract and not any(part.startswith('$') for part in parts):
-                        if not any(word.lower() in ['yet', 'awarded', 'available'] for word in parts):
-                            current_contract.contract_name += ' ' + line
-                
-                # Save the last contract if exists
+
+                        # If not date or amount, it's part of the contract name
+                        contract_parts.append(part)
+
+                    current_contract['contract_name'] = ' '.join(contract_parts)
+
+            except Exception as e:
+                logger.error(f"Error processing line: {line}")
+                logger.error(str(e))
+                continue
+
+        # Handle continuation lines (additional contract name parts)
+        elif not any(part.startswith('$') for part in parts):
+            if not any(word.lower() in CONTINUATION_STOP_WORDS for word in parts):
                 if current_contract:
-                    if current_contract.value is None:
-                        current_contract.value = 0.0
-                    db.session.add(current_contract)
-                    db.session.commit()
-                    logger.info(f"Successfully added contract: {current_contract.contract_name}")
-                    
-        return True
-        
+                    current_contract['contract_name'] += ' ' + line
+                else:
+                    leading_lines.append(line)
+
+    return leading_lines, records
+
+def merge_page_results(page_results):
+    """
+    Combine per-page parse results, in page order, into one list of records.
+
+    A contract name that wraps onto the next page continues with that page's
+    leading lines.
+    """
+    records = []
+    for leading_lines, page_records in page_results:
+        if leading_lines and records:
+            records[-1]['contract_name'] += ' ' + ' '.join(leading_lines)
+        records.extend(page_records)
+    return records
+
+def parse_page_range(pdf_path, start, stop):
+    """
+    Parse pages [start, stop) of the PDF. Runs in worker processes, so it opens the file itself.
+
+    Returns:
+        list: parse_page_text results, one per page
+    """
+    results = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num in range(start, stop):
+            text = pdf.pages[page_num].extract_text() or ''
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"\nRaw text from page {page_num + 1}:")
+                logger.debug(text)
+            results.append(parse_page_text(text))
+    return results
+
+def _split_range(start, stop, workers):
+    """Split pages [start, stop) into contiguous chunks, several per worker so uneven pages balance out."""
+    if not workers or workers <= 1:
+        return [(start, stop)]
+    chunk_size = max(1, math.ceil((stop - start) / (workers * 4)))
+    return [(chunk, min(chunk + chunk_size, stop)) for chunk in range(start, stop, chunk_size)]
+
+def parse_page_ranges(pdf_path, ranges, workers=None):
+    """
+    Parse the given (start, stop) page ranges of the PDF.
+
+    Args:
+        pdf_path (str): Path of the contract PDF
+        ranges (list): (start, stop) page ranges to parse
+        workers (int): Number of worker processes to split the pages across;
+            None or 1 parses serially in this process
+
+    Returns:
+        dict: parse_page_text result for each parsed page number
+    """
+    chunks = [chunk for start, stop in ranges for chunk in _split_range(start, stop, workers)]
+    if not workers or workers <= 1 or len(chunks) <= 1:
+        chunk_results = [parse_page_range(pdf_path, start, stop) for start, stop in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            futures = [executor.submit(parse_page_range, pdf_path, start, stop) for start, stop in chunks]
+            chunk_results = [future.result() for future in futures]
+
+    pages = {}
+    for (start, _), results in zip(chunks, chunk_results):
+        for offset, result in enumerate(results):
+            pages[start + offset] = result
+    return pages
+
+def parse_pdf_records(pdf_path, workers=None):
+    """
+    Parse every contract record in the PDF without touching the database.
+
+    Args:
+        pdf_path (str): Path of the contract PDF
+        workers (int): Number of worker processes to split the pages across;
+            None or 1 parses serially in this process
+
+    Returns:
+        list: Contract records in page order, identical for serial and parallel parsing
+    """
+    logger.info(f"Opening PDF file: {pdf_path}")
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+    logger.info(f"Successfully opened PDF with {page_count} pages")
+
+    pages = parse_page_ranges(pdf_path, [(0, page_count)], workers=workers)
+    return merge_page_results(pages[page_num] for page_num in range(page_count))
+
+def upsert_contracts(records, batch_size=500):
+    """
+    Insert or update contract records keyed on contract_number in a single transaction.
+
+    Existing contracts are looked up once per batch; new contracts are inserted,
+    changed ones have their imported fields updated, and unchanged ones (or earlier
+    duplicates of a contract number within `records`) are skipped.
+
+    Returns:
+        dict: Counts of 'inserted', 'updated' and 'skipped' contracts
+    """
+    try:
+        summary = _write_contracts(records, batch_size)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    logger.info(f"Imported contracts: {summary['inserted']} inserted, "
+                f"{summary['updated']} updated, {summary['skipped']} skipped")
+    return summary
+
+def _write_contracts(records, batch_size):
+    """Upsert records in batches inside the current transaction, returning upsert_contracts' counts."""
+    summary = {'inserted': 0, 'updated': 0, 'skipped': 0}
+
+    # The last occurrence of a contract number wins
+    unique = {}
+    for record in records:
+        if record['contract_number'] in unique:
+            summary['skipped'] += 1
+        unique[record['contract_number']] = record
+    records = list(unique.values())
+
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        existing = {
+            row.contract_number: row for row in db.session.execute(
+                select(Contract.contract_number, *[getattr(Contract, f) for f in IMPORTED_FIELDS])
+                .where(Contract.contract_number.in_([r['contract_number'] for r in batch]))
+            )
+        }
+
+        changed = []
+        for record in batch:
+            current = existing.get(record['contract_number'])
+            if current is None:
+                summary['inserted'] += 1
+            elif any(getattr(current, f) != record[f] for f in IMPORTED_FIELDS):
+                summary['updated'] += 1
+            else:
+                summary['skipped'] += 1
+                continue
+            changed.append(record)
+
+        if changed:
+            statement = sqlite_insert(Contract).values(changed)
+            statement = statement.on_conflict_do_update(
+                index_elements=[Contract.contract_number],
+                set_={f: statement.excluded[f] for f in IMPORTED_FIELDS}
+            )
+            db.session.execute(statement)
+
+    return summary
+
+def file_fingerprint(pdf_path):
+    """SHA-256 of the file's bytes."""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def page_fingerprint(page):
+    """
+    SHA-256 of a page's raw content streams.
+
+    This is far cheaper than extracting the text, and any edit to the page's
+    text changes it. Falls back to the extracted text for unusual page objects.
+    """
+    digest = hashlib.sha256()
+    try:
+        for stream in page.page_obj.contents:
+            digest.update(resolve1(stream).get_data())
+    except Exception:
+        digest.update((page.extract_text() or '').encode())
+    return digest.hexdigest()
+
+def _contiguous_runs(page_numbers):
+    """Group sorted page numbers into (start, stop) ranges of consecutive pages."""
+    runs = []
+    for page_num in page_numbers:
+        if runs and runs[-1][1] == page_num:
+            runs[-1][1] = page_num + 1
+        else:
+            runs.append([page_num, page_num + 1])
+    return [tuple(run) for run in runs]
+
+def _last_on_page(parsed, page_num, record):
+    page_records = parsed[page_num][1]
+    return bool(page_records) and page_records[-1] is record
+
+def import_pdf_incremental(pdf_path, batch_size=500, workers=None):
+    """
+    Re-import a contract PDF, reprocessing only the pages that changed since the last import.
+
+    A file whose hash matches the last import is skipped outright. Otherwise each
+    page's content hash is compared with the stored one, and only changed pages
+    (plus their neighbours, since a contract name can wrap across a page boundary)
+    are parsed. Their contracts are upserted, contracts that disappeared from those
+    pages are deleted, and the new fingerprints are saved in the same transaction.
+
+    Args:
+        pdf_path (str): Path of the contract PDF
+        batch_size (int): Number of contracts written per upsert statement
+        workers (int): Worker processes for page extraction (None parses serially)
+
+    Returns:
+        dict: 'file_unchanged', 'pages', 'pages_changed', 'pages_parsed' and the
+        'inserted', 'updated', 'skipped' and 'removed' contract counts
+    """
+    source_path = os.path.abspath(pdf_path)
+    file_hash = file_fingerprint(source_path)
+    summary = {'file_unchanged': False, 'pages': 0, 'pages_changed': 0, 'pages_parsed': 0,
+               'inserted': 0, 'updated': 0, 'skipped': 0, 'removed': 0}
+
+    imported_file = ImportedFile.query.filter_by(source_path=source_path).first()
+    if imported_file and imported_file.file_hash == file_hash:
+        logger.info(f"PDF unchanged since last import: {source_path}")
+        summary.update(file_unchanged=True, pages=imported_file.page_count)
+        return summary
+
+    with span('pdf_fingerprint'), pdfplumber.open(source_path) as pdf:
+        fingerprints = [page_fingerprint(page) for page in pdf.pages]
+    page_count = len(fingerprints)
+    summary['pages'] = page_count
+
+    stored_pages = {}
+    if imported_file:
+        stored_pages = {page.page_number: page for page in
+                        ImportedPage.query.filter_by(file_id=imported_file.id)}
+    changed = [page_num for page_num in range(page_count)
+               if page_num not in stored_pages or stored_pages[page_num].content_hash != fingerprints[page_num]]
+    summary['pages_changed'] = len(changed)
+
+    # Neighbouring pages are parsed too: a changed page's leading lines finish the
+    # previous page's last contract, and the next page's leading lines finish its own
+    changed_set = set(changed)
+    to_parse = sorted({neighbour for page_num in changed for neighbour in (page_num - 1, page_num, page_num + 1)
+                       if 0 <= neighbour < page_count})
+    summary['pages_parsed'] = len(to_parse)
+    with span('pdf_parse'):
+        parsed = parse_page_ranges(source_path, _contiguous_runs(to_parse), workers=workers)
+
+    # Only contracts starting on changed pages, and the contract wrapping onto one, can differ
+    records = []
+    for page_num in to_parse:
+        leading_lines, page_records = parsed[page_num]
+        if leading_lines and records and records[-1][0] == page_num - 1:
+            records[-1][1]['contract_name'] += ' ' + ' '.join(leading_lines)
+        records.extend((page_num, record) for record in page_records)
+    records = [record for page_num, record in records
+               if page_num in changed_set or (page_num + 1 in changed_set and _last_on_page(parsed, page_num, record))]
+
+    new_numbers = {record['contract_number'] for record in records}
+    old_numbers = set()
+    for page_num, page in stored_pages.items():
+        if (page_num in changed_set or page_num >= page_count) and page.contract_numbers:
+            old_numbers.update(page.contract_numbers.split(','))
+    removed = old_numbers - new_numbers
+
+    with span('pdf_db_write'):
+        try:
+            summary.update(_write_contracts(records, batch_size))
+            if removed:
+                summary['removed'] = Contract.query.filter(Contract.contract_number.in_(removed)).delete(
+                    synchronize_session=False)
+
+            if imported_file is None:
+                imported_file = ImportedFile(source_path=source_path)
+                db.session.add(imported_file)
+            imported_file.file_hash = file_hash
+            imported_file.page_count = page_count
+            imported_file.imported_at = datetime.utcnow()
+            db.session.flush()
+
+            for page_num, page in stored_pages.items():
+                if page_num >= page_count:
+                    db.session.delete(page)
+            for page_num in changed:
+                page = stored_pages.get(page_num)
+                if page is None:
+                    page = ImportedPage(file_id=imported_file.id, page_number=page_num)
+                    db.session.add(page)
+                page.content_hash = fingerprints[page_num]
+                page.contract_numbers = ','.join(r['contract_number'] for r in parsed[page_num][1])
+
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    logger.info(f"Incremental import of {source_path}: {summary['pages_changed']} of {page_count} pages changed, "
+                f"{summary['inserted']} inserted, {summary['updated']} updated, {summary['removed']} removed")
+    return summary
+
+def extract_pdf_data(pdf_path, batch_size=500, workers=None):
+    """
+    Extract contract data from PDF and store in database.
+
+    Args:
+        pdf_path (str): Path of the contract PDF
+        batch_size (int): Number of contracts written per upsert statement
+        workers (int): Worker processes for page extraction (None parses serially)
+
+    Returns:
+        dict: Counts of 'inserted', 'updated' and 'skipped' contracts, or False on error
+    """
+    try:
+        with span('pdf_parse'):
+            records = parse_pdf_records(pdf_path, workers=workers)
+        with span('pdf_db_write'):
+            return upsert_contracts(records, batch_size=batch_size)
+
     except Exception as e:
         logger.error(f"Error processing PDF: {str(e)}")
         db.session.rollback()
         return False
 
-def generate_pdf_report(output_path, contracts=None, sort_by='expiration_date', order='asc', active_only=False, report_type=None):
-    """Generate a PDF report of contracts."""
-    # Use landscape orientation for more width
-    doc = SimpleDocTemplate(
-        output_path,
-        pagesize=landscape(letter),
-        leftMargin=36,
-        rightMargin=36,
-        topMargin=36,
-        bottomMargin=36
-    )
+REPORT_SORT_FIELDS = ['contract_number', 'contract_name', 'start_date', 'expiration_date', 'value', 'status']
+
+def report_query(sort_by='expiration_date', order='asc', active_only=False):
+    """Query for the contracts in a report, filtered and sorted as requested."""
+    query = Contract.query
+    if active_only:
+        query = query.filter(Contract.status == 'Active')
+
+    if sort_by not in REPORT_SORT_FIELDS:
+        sort_by = 'expiration_date'
+    column = getattr(Contract, sort_by)
+    if order == 'desc':
+        return query.order_by(column.desc(), Contract.id.desc())
+    return query.order_by(column.asc(), Contract.id.asc())
+
+def generate_pdf_report(output_path, contracts=None, sort_by='expiration_date', order='asc', active_only=False, report_type=None, renderer='platypus'):
+    """
+    Generate a PDF report of contracts.
+
+    `output_path` may be a path or a writable binary file object. With
+    renderer='canvas' the report is drawn by stream_pdf_report instead of
+    being laid out as a platypus table.
+    """
+    if renderer == 'canvas':
+        with span('report_render'):
+            return stream_pdf_report(output_path, contracts, sort_by, order, active_only, report_type)
+
+    with span('report_layout'):
+        # Query all contracts if not provided
+        if contracts is None:
+            contracts = report_query(sort_by, order, active_only).all()
+
+        # Use landscape orientation for more width
+        doc = SimpleDocTemplate(
+            output_path,
+            pagesize=landscape(letter),
+            leftMargin=36,
+            rightMargin=36,
+            topMargin=36,
+            bottomMargin=36
+        )
     
-    elements = []
-    styles = getSampleStyleSheet()
+        elements = []
+        styles = getSampleStyleSheet()
     
-    # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Normal'],
-        fontSize=12,
-        alignment=1,  # Center alignment
-        spaceAfter=20
-    )
-    title = "Hudson County Correctional Facility - Contract Report"
-    elements.append(Paragraph(title, title_style))
+        # Title
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Normal'],
+            fontSize=12,
+            alignment=1,  # Center alignment
+            spaceAfter=20
+        )
+        title = "Hudson County Correctional Facility - Contract Report"
+        elements.append(Paragraph(title, title_style))
     
-    if report_type == 'simplified':
-        # Simplified report with only contract name, dates, and value
-        data = [['Contract Name', 'Start Date', 'Expiration Date', 'Value']]
+        if report_type == 'simplified':
+            # Simplified report with only contract name, dates, and value
+            data = [['Contract Name', 'Start Date', 'Expiration Date', 'Value']]
         
-        # Query all contracts if not provided
-        if contracts is None:
-            from app import Contract
-            query = Contract.query
-            
-            # Apply sorting
-            if sort_by == 'expiration_date':
-                if order == 'asc':
-                    query = query.order_by(Contract.expiration_date.asc())
-                else:
-                    query = query.order_by(Contract.expiration_date.desc())
-            
-            if active_only:
-                query = query.filter(Contract.status == 'Active')
-            
-            contracts = query.all()
-        
-        for contract in contracts:
-            # Create Paragraph for contract name to enable proper wrapping
-            contract_name = Paragraph(
-                contract.contract_name,
-                ParagraphStyle(
-                    'ContractName',
-                    fontSize=10,
-                    leading=12,  # Line spacing
-                    spaceBefore=0,
-                    spaceAfter=0,
-                )
+            name_style = ParagraphStyle(
+                'ContractName',
+                fontSize=10,
+                leading=12,  # Line spacing
+                spaceBefore=0,
+                spaceAfter=0,
             )
-            data.append([
-                contract_name,  # Use Paragraph object instead of plain text
-                contract.start_date.strftime('%Y-%m-%d') if contract.start_date else '',
-                contract.expiration_date.strftime('%Y-%m-%d') if contract.expiration_date else '',
-                "${:,.2f}".format(contract.value) if contract.value else ''
-            ])
+            for contract in contracts:
+                # Create Paragraph for contract name to enable proper wrapping
+                contract_name = Paragraph(contract.contract_name, name_style)
+                data.append([
+                    contract_name,  # Use Paragraph object instead of plain text
+                    contract.start_date.strftime('%Y-%m-%d') if contract.start_date else '',
+                    contract.expiration_date.strftime('%Y-%m-%d') if contract.expiration_date else '',
+                    "${:,.2f}".format(contract.value) if contract.value else ''
+                ])
         
-        # Create table with specific column widths
-        available_width = doc.width  # Use full available width
-        col_widths = [available_width * 0.5, available_width * 0.15, available_width * 0.15, available_width * 0.2]
-        table = Table(data, colWidths=col_widths, repeatRows=1)  # repeatRows=1 makes header repeat on each page
+            # Create table with specific column widths
+            available_width = doc.width  # Use full available width
+            col_widths = [available_width * 0.5, available_width * 0.15, available_width * 0.15, available_width * 0.2]
+            table = Table(data, colWidths=col_widths, repeatRows=1)  # repeatRows=1 makes header repeat on each page
         
-        # Style the table to match the example
-        table.setStyle(TableStyle([
-            # Header style
-            ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.85, 0.85, 0.85)),  # Light gray
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            # Style the table to match the example
+            table.setStyle(TableStyle([
+                # Header style
+                ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.85, 0.85, 0.85)),  # Light gray
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
             
-            # Content style
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ALIGN', (0, 1), (0, -1), 'LEFT'),    # Left align contract names
-            ('ALIGN', (1, 1), (2, -1), 'CENTER'),  # Center align dates
-            ('ALIGN', (3, 1), (3, -1), 'RIGHT'),   # Right align values
+                # Content style
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 1), (-1, -1), 10),
+                ('ALIGN', (0, 1), (0, -1), 'LEFT'),    # Left align contract names
+                ('ALIGN', (1, 1), (2, -1), 'CENTER'),  # Center align dates
+                ('ALIGN', (3, 1), (3, -1), 'RIGHT'),   # Right align values
             
-            # Grid
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('LINEBELOW', (0, 0), (-1, 0), 1, colors.grey),  # Slightly thicker line below header
+                # Grid
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('LINEBELOW', (0, 0), (-1, 0), 1, colors.grey),  # Slightly thicker line below header
             
-            # Padding
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+                # Padding
+                ('TOPPADDING', (0, 0), (-1, -1), 6),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                ('LEFTPADDING', (0, 0), (-1, -1), 8),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 8),
             
-            # Text wrapping and alignment
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),  # Vertically center all content
-        ]))
-        
-        # Add table to elements
-        elements.append(table)
+                # Text wrapping and alignment
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),  # Vertically center all content
+            ]))
         
-        # Build the PDF
-        doc.build(elements)
-    else:
-        # Full report with all details
-        data = [['Contract #', 'Contract Name', 'Start Date', 'Expiration Date', 'Value', 'Status', 'Notes']]
-        for contract in contracts:
-            data.append([
-                contract.contract_number,
-                contract.contract_name,
-                contract.start_date.strftime('%Y-%m-%d') if contract.start_date else '',
-                contract.expiration_date.strftime('%Y-%m-%d') if contract.expiration_date else '',
-                "${:,.2f}".format(contract.value) if contract.value else '',
-                contract.status,
-                contract.notes if contract.notes else ''
-            ])
+            # Add table to elements
+            elements.append(table)
+        else:
+            # Full report with all details
+            data = [['Contract #', 'Contract Name', 'Start Date', 'Expiration Date', 'Value', 'Status', 'Notes']]
+            for contract in contracts:
+                data.append([
+                    contract.contract_number,
+                    contract.contract_name,
+                    contract.start_date.strftime('%Y-%m-%d') if contract.start_date else '',
+                    contract.expiration_date.strftime('%Y-%m-%d') if contract.expiration_date else '',
+                    "${:,.2f}".format(contract.value) if contract.value else '',
+                    contract.status,
+                    contract.notes if contract.notes else ''
+                ])
         
-        # Create the table with appropriate styling
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-        ]))
+            # Create the table with appropriate styling
+            table = Table(data)
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 12),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 1), (-1, -1), 10),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ]))
     
-        elements.append(table)
+            elements.append(table)
+
+    # Build the PDF
+    with span('report_build'):
         doc.build(elements)
+
+# Fixed layout for stream_pdf_report, matching the platypus reports above
+PAGE_SIZE = landscape(letter)
+PAGE_MARGIN = 36
+FRAME_PADDING = 6  # platypus frames inset their content by this much
+REPORT_TITLE = "Hudson County Correctional Facility - Contract Report"
+
+SIMPLIFIED_LAYOUT = {
+    'columns': [
+        # (header, field, share of the page width, alignment, wraps)
+        ('Contract Name', 'contract_name', 0.5, 'LEFT', True),
+        ('Start Date', 'start_date', 0.15, 'CENTER', False),
+        ('Expiration Date', 'expiration_date', 0.15, 'CENTER', False),
+        ('Value', 'value', 0.2, 'RIGHT', False),
+    ],
+    'header_font': ('Helvetica', 10),
+    'header_fill': colors.Color(0.85, 0.85, 0.85),
+    'header_text': colors.black,
+    'header_padding': (6, 6),
+    'body_font': ('Helvetica', 10),
+    'leading': 12,
+    'padding': (6, 6, 8),  # top, bottom, left/right
+    'grid': (0.5, colors.grey),
+    'repeat_header': True,
+}
+
+FULL_LAYOUT = {
+    'columns': [
+        ('Contract #', 'contract_number', 0.09, 'CENTER', False),
+        ('Contract Name', 'contract_name', 0.27, 'CENTER', True),
+        ('Start Date', 'start_date', 0.1, 'CENTER', False),
+        ('Expiration Date', 'expiration_date', 0.135, 'CENTER', False),
+        ('Value', 'value', 0.12, 'CENTER', False),
+        ('Status', 'status', 0.08, 'CENTER', False),
+        ('Notes', 'notes', 0.205, 'CENTER', True),
+    ],
+    'header_font': ('Helvetica-Bold', 12),
+    'header_fill': colors.grey,
+    'header_text': colors.whitesmoke,
+    'header_padding': (3, 12),
+    'body_font': ('Helvetica', 10),
+    'leading': 12,
+    'padding': (3, 3, 6),
+    'grid': (1, colors.black),
+    'repeat_header': False,
+}
+
+def _format_cell(field, value):
+    if value is None:
+        return ''
+    if field in ('start_date', 'expiration_date'):
+        return value.strftime('%Y-%m-%d')
+    if field == 'value':
+        return "${:,.2f}".format(value) if value else ''
+    return str(value)
+
+def stream_pdf_report(output, contracts=None, sort_by='expiration_date', order='asc', active_only=False,
+                      report_type=None, chunk_size=500):
+    """
+    Draw a contract report directly on a canvas, fetching contracts in chunks.
+
+    Unlike generate_pdf_report, no platypus Table is built: column widths are fixed
+    up front, wrapped cells are split with precomputed font metrics, and each row
+    is drawn as soon as it is fetched, so the contracts are never all loaded at
+    once. The drawn pages are still kept by the canvas until the PDF is saved, and
+    /generate_report buffers the finished PDF, so the output itself is not
+    streamed. The layout follows the simplified and full platypus reports.
+
+    Args:
+        output: Path or writable binary file object to write the PDF to
+        contracts: Rows to render; by default the report query is streamed from
+            the database `chunk_size` rows at a time
+        chunk_size (int): Rows fetched per round trip when querying
+    """
+    layout = SIMPLIFIED_LAYOUT if report_type == 'simplified' else FULL_LAYOUT
+    fields = [column[1] for column in layout['columns']]
+    if contracts is None:
+        contracts = report_query(sort_by, order, active_only).with_entities(
+            *[getattr(Contract, f) for f in fields]).yield_per(chunk_size)
+
+    page_width, page_height = PAGE_SIZE
+    available_width = page_width - 2 * PAGE_MARGIN
+    widths = [available_width * column[2] for column in layout['columns']]
+    xs = [PAGE_MARGIN]
+    for width in widths:
+        xs.append(xs[-1] + width)
+
+    body_font, body_size = layout['body_font']
+    leading = layout['leading']
+    pad_top, pad_bottom, pad_side = layout['padding']
+    grid_width, grid_color = layout['grid']
+
+    pdf = canvas.Canvas(output, pagesize=PAGE_SIZE)
+    pdf.setTitle(REPORT_TITLE)
+
+    def draw_text(text, font, size, column, baseline, align):
+        pdf.setFont(font, size)
+        if align == 'LEFT':
+            pdf.drawString(xs[column] + pad_side, baseline, text)
+        elif align == 'RIGHT':
+            pdf.drawRightString(xs[column + 1] - pad_side, baseline, text)
+        else:
+            pdf.drawCentredString((xs[column] + xs[column + 1]) / 2, baseline, text)
+
+    def draw_header(top):
+        font, size = layout['header_font']
+        header_top, header_bottom = layout['header_padding']
+        height = header_top + size * 1.2 + header_bottom
+        pdf.setFillColor(layout['header_fill'])
+        pdf.rect(xs[0], top - height, xs[-1] - xs[0], height, stroke=0, fill=1)
+        pdf.setFillColor(layout['header_text'])
+        baseline = top - header_top - size * 0.8
+        for column, (header, _, _, _, _) in enumerate(layout['columns']):
+            draw_text(header, font, size, column, baseline, 'CENTER')
+        pdf.setFillColor(colors.black)
+        pdf.setStrokeColor(grid_color)
+        pdf.setLineWidth(grid_width)
+        pdf.grid(xs, [top, top - height])
+        return top - height
+
+    def start_page(first):
+        top = page_height - PAGE_MARGIN - FRAME_PADDING
+        if first:
+            pdf.setFont('Helvetica', 12)
+            pdf.drawCentredString(page_width / 2, top - 10, REPORT_TITLE)
+            top -= 12 + 20  # title leading and its spaceAfter
+        if first or layout['repeat_header']:
+            top = draw_header(top)
+        return top
+
+    y = start_page(first=True)
+    bottom = PAGE_MARGIN + FRAME_PADDING
+    for row in contracts:
+        cells = []
+        lines_needed = 1
+        for column, field in enumerate(fields):
+            text = _format_cell(field, getattr(row, field))
+            if layout['columns'][column][4]:
+                lines = simpleSplit(text, body_font, body_size, widths[column] - 2 * pad_side) or ['']
+            else:
+                lines = [text]
+            cells.append(lines)
+            lines_needed = max(lines_needed, len(lines))
+        height = pad_top + lines_needed * leading + pad_bottom
+
+        if y - height < bottom:
+            pdf.showPage()
+            y = start_page(first=False)
+
+        pdf.setFont(body_font, body_size)
+        middle = y - height / 2
+        for column, lines in enumerate(cells):
+            # Vertically centre each cell's block of lines in the row
+            baseline = middle + (len(lines) * leading) / 2 - leading + (leading - body_size) / 2 + 1
+            for line in lines:
+                draw_text(line, body_font, body_size, column, baseline, layout['columns'][column][3])
+                baseline -= leading
+        pdf.setStrokeColor(grid_color)
+        pdf.setLineWidth(grid_width)
+        pdf.grid(xs, [y, y - height])
+        y -= height
+
+    pdf.save()
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from typing import Any, Callable, Dict, Optional
+
+from data_version import DataStamp
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE_RE = re.compile(r'report_([0-9a-f]*)_(\d+)_[0-9a-f]{64}\.pdf$')
+
+class ReportCache:
+    """
+    Generated PDF reports on disk, keyed by report parameters and data stamp.
+
+    A file is named after the data stamp (database epoch and data version) it was
+    rendered from and a hash of the parameters, so a hit can be served as-is and
+    any contract change, or recreating the database, makes every older file
+    unreachable. Superseded files are deleted on the next write, and the directory
+    is kept under REPORT_CACHE_MAX_BYTES and REPORT_CACHE_MAX_AGE.
+    """
+
+    def __init__(self, app=None):
+        self.directory = None
+        self.max_bytes = None
+        self.max_age = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault('REPORT_DIR', os.path.join(app.root_path, 'static', 'reports'))
+        app.config.setdefault('REPORT_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+        app.config.setdefault('REPORT_CACHE_MAX_AGE', 7 * 24 * 3600)
+        self.directory = app.config['REPORT_DIR']
+        self.max_bytes = app.config['REPORT_CACHE_MAX_BYTES']
+        self.max_age = app.config['REPORT_CACHE_MAX_AGE']
+        app.extensions['report_cache'] = self
+
+    def path_for(self, params: Dict[str, Any], stamp: DataStamp) -> str:
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+        return os.path.join(self.directory, f'report_{stamp.epoch}_{int(stamp.version)}_{digest}.pdf')
+
+    def get(self, params: Dict[str, Any], stamp: DataStamp) -> Optional[str]:
+        """Path of the cached report, or None on a miss."""
+        path = self.path_for(params, stamp)
+        try:
+            os.utime(path)  # mark as recently used for eviction
+        except FileNotFoundError:
+            return None
+        logger.info(f"Report cache hit: {os.path.basename(path)}")
+        return path
+
+    def put(self, params: Dict[str, Any], stamp: DataStamp, render: Callable[[str], Any]) -> str:
+        """
+        Render a report into the cache and return its path.
+
+        The report is rendered to a temporary file and renamed into place, so
+        readers never see a partially written PDF.
+
+        Args:
+            params (dict): Report parameters
+            stamp (DataStamp): Data stamp read before rendering started
+            render (callable): Writes the report to the path it is given
+        """
+        temporary = self.temporary_path()
+        try:
+            render(temporary)
+            path = self.publish(params, stamp, temporary)
+        except Exception:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        self.evict(current=stamp)
+        return path
+
+    def temporary_path(self) -> str:
+        """New empty file in the cache directory for a report to be rendered into."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(suffix='.pdf.tmp', dir=self.directory)
+        os.close(fd)
+        return temporary
+
+    def publish(self, params: Dict[str, Any], stamp: DataStamp, temporary: str) -> str:
+        """Atomically move a report rendered into temporary_path() into the cache."""
+        path = self.path_for(params, stamp)
+        os.replace(temporary, path)
+        logger.info(f"Report cached: {os.path.basename(path)}")
+        return path
+
+    def evict(self, current: Optional[DataStamp] = None) -> int:
+        """
+        Delete superseded, expired and least recently used reports.
+
+        Given the current data stamp, reports of older versions, of other epochs and
+        in an older file naming scheme are superseded.
+
+        Returns:
+            int: Number of files removed
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+
+        now = time.time()
+        entries = []
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or not entry.name.endswith('.pdf'):
+                continue
+            stat = entry.stat()
+            match = CACHE_FILE_RE.match(entry.name)
+            superseded = current is not None and (
+                not match or match.group(1) != current.epoch or int(match.group(2)) < current.version)
+            if superseded or now - stat.st_mtime > self.max_age:
+                removed += self._remove(entry.path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            removed += self._remove(path)
+            total -= size
+
+        if removed:
+            logger.info(f"Evicted {removed} cached reports")
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except FileNotFoundError:
+            return 0
@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+def normalize_report_params(
+    sort_by: Optional[str] = None,
+    order: Optional[str] = None,
+    active_only: Any = False,
+    report_type: Optional[str] = None,
+    renderer: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Canonical report parameters, so equivalent requests compare equal.
+
+    renderer is 'platypus' (table layout) or 'canvas' (streaming renderer).
+    """
+    if isinstance(active_only, str):
+        active_only = active_only.lower() == 'true'
+    return {
+        'sort_by': sort_by or 'expiration_date',
+        'order': 'desc' if (order or '').lower() == 'desc' else 'asc',
+        'active_only': bool(active_only),
+        'report_type': report_type or None,
+        'renderer': 'canvas' if renderer == 'canvas' else 'platypus',
+    }
+
+def _params_key(params: Dict[str, Any]) -> tuple:
+    return tuple(sorted(params.items()))
+
+@dataclass
+class ReportJob:
+    """A report being generated in the background."""
+    id: str
+    params: Dict[str, Any]
+    status: str = PENDING
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def key(self) -> tuple:
+        return _params_key(self.params)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'params': self.params,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+
+class ReportJobManager:
+    """
+    Generates PDF reports on a thread pool so requests return immediately.
+
+    Reports are rendered through the app's ReportCache, which must be initialised.
+
+    Requests with the same parameters as a job that is still pending or running
+    share that job. Finished jobs are kept for REPORT_JOB_TTL seconds. A manager
+    serves one app, and jobs live in this process, so each worker of a
+    multi-process deployment has its own.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.executor = None
+        self.jobs: Dict[str, ReportJob] = {}
+        self.in_flight: Dict[tuple, str] = {}
+        self.lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault('REPORT_JOB_WORKERS', 2)
+        app.config.setdefault('REPORT_JOB_TTL', 3600)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        self.app = app
+        self.executor = ThreadPoolExecutor(max_workers=app.config['REPORT_JOB_WORKERS'],
+                                           thread_name_prefix='report-job')
+        app.extensions['report_jobs'] = self
+
+    def submit(self, params: Dict[str, Any]) -> ReportJob:
+        """
+        Queue a report, or return the in-flight job already producing it.
+
+        Args:
+            params (dict): Report parameters from normalize_report_params
+
+        Returns:
+            ReportJob: The job generating the report
+        """
+        with self.lock:
+            self._prune()
+            key = _params_key(params)
+            job_id = self.in_flight.get(key)
+            if job_id is not None:
+                return self.jobs[job_id]
+
+            job = ReportJob(id=uuid.uuid4().hex, params=params)
+            self.jobs[job.id] = job
+            self.in_flight[key] = job.id
+
+        self.executor.submit(self._run, job)
+        logger.info(f"Queued report job {job.id} with {params}")
+        return job
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _run(self, job: ReportJob) -> None:
+        from data_version import get_data_stamp
+        from pdf_operations import generate_pdf_report
+
+        job.status = RUNNING
+        try:
+            with self.app.app_context():
+                cache = self.app.extensions['report_cache']
+                stamp = get_data_stamp()
+                output_path = cache.get(job.params, stamp)
+                if output_path is None:
+                    output_path = cache.put(job.params, stamp,
+                                            lambda path: generate_pdf_report(path, **job.params))
+            job.output_path = output_path
+            job.status = DONE
+            logger.info(f"Report job {job.id} finished")
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+            logger.error(f"Report job {job.id} failed: {str(e)}")
+        finally:
+            job.finished_at = time.time()
+            with self.lock:
+                self.in_flight.pop(job.key, None)
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than REPORT_JOB_TTL. Caller holds the lock."""
+        cutoff = time.time() - self.app.config['REPORT_JOB_TTL']
+        for job_id in [job_id for job_id, job in self.jobs.items()
+                       if job.finished_at is not None and job.finished_at < cutoff]:
+            del self.jobs[job_id]
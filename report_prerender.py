@@ -0,0 +1,171 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from contract_export import EXPORT_FIELDS, contract_columns
+from data_version import DataStamp
+from metrics import span
+from models import Contract, DataVersion
+from report_jobs import normalize_report_params
+from search_cache import ContractRow
+from storage import read_engine
+
+logger = logging.getLogger(__name__)
+
+# The report variants linked from the index page's "Generate Report" dropdown
+STANDARD_REPORTS = [
+    {'sort_by': 'expiration_date', 'order': 'asc'},
+    {'sort_by': 'expiration_date', 'order': 'desc'},
+    {'sort_by': 'value', 'order': 'desc'},
+    {'sort_by': 'status'},
+    {'sort_by': 'expiration_date', 'order': 'asc', 'active_only': True},
+    {'sort_by': 'expiration_date', 'order': 'desc', 'active_only': True},
+    {'sort_by': 'expiration_date', 'order': 'asc', 'report_type': 'simplified'},
+    {'sort_by': 'expiration_date', 'order': 'desc', 'report_type': 'simplified'},
+]
+
+# Contracts shared by the rendering processes, set once per process by _init_worker
+_snapshot: Sequence[ContractRow] = ()
+
+def standard_report_params(renderer: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Normalized parameters of every standard report, as the dropdown links request them."""
+    renderer = renderer or current_app.config['REPORT_RENDERER']
+    return [normalize_report_params(renderer=renderer, **variant) for variant in STANDARD_REPORTS]
+
+def load_snapshot() -> Tuple[DataStamp, List[ContractRow]]:
+    """
+    Read every contract and the data stamp they belong to in one read transaction.
+
+    Returns:
+        tuple: (data stamp, contracts in id order)
+    """
+    # pysqlite only opens transactions implicitly for DML, so the read is wrapped by hand
+    with read_engine().connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        connection.exec_driver_sql('BEGIN')
+        try:
+            row = connection.execute(select(DataVersion.epoch, DataVersion.version).where(DataVersion.id == 1)).first()
+            stamp = DataStamp(row.epoch or '', row.version) if row else DataStamp('', 0)
+            rows = [ContractRow(*row) for row in connection.execute(
+                select(*contract_columns(EXPORT_FIELDS)).order_by(Contract.id))]
+        finally:
+            connection.exec_driver_sql('COMMIT')
+    return stamp, rows
+
+def report_rows(rows: Sequence[ContractRow], sort_by: str = 'expiration_date', order: str = 'asc',
+                active_only: bool = False) -> List[ContractRow]:
+    """
+    Filter and sort snapshot rows the way pdf_operations.report_query does in SQL.
+
+    Rows are ordered by the sort field then id, with missing values first when
+    ascending and last when descending, as SQLite orders NULLs.
+    """
+    from pdf_operations import REPORT_SORT_FIELDS
+
+    if sort_by not in REPORT_SORT_FIELDS:
+        sort_by = 'expiration_date'
+    if active_only:
+        rows = [row for row in rows if row.status == 'Active']
+
+    def key(row):
+        value = getattr(row, sort_by)
+        return (value is not None, value if value is not None else 0, row.id)
+
+    return sorted(rows, key=key, reverse=order == 'desc')
+
+def _init_worker(rows: Sequence[ContractRow]) -> None:
+    global _snapshot
+    _snapshot = rows
+
+def _render(params: Dict[str, Any], output_path: str) -> str:
+    """Render one report from the worker's snapshot into output_path."""
+    from pdf_operations import generate_pdf_report
+
+    rows = report_rows(_snapshot, params['sort_by'], params['order'], params['active_only'])
+    generate_pdf_report(output_path, contracts=rows, **params)
+    return output_path
+
+def prerender_reports(renderer: Optional[str] = None, workers: Optional[int] = None,
+                      force: bool = False) -> Dict[str, Any]:
+    """
+    Render every standard report into the report cache, in parallel.
+
+    The contracts are read once, and each worker process receives that snapshot
+    when it starts rather than querying for every report. Reports are written to
+    temporary files and renamed into the cache only after all of them rendered, so
+    the dropdown links switch from one data version to the next together. Reports
+    already cached for the snapshot's data version are skipped unless `force`.
+
+    Must run inside an app context.
+
+    Args:
+        renderer (str): 'platypus' or 'canvas' (default: REPORT_RENDERER)
+        workers (int): Worker processes (default: one per report, up to the CPU count)
+        force (bool): Render even the reports that are already cached
+
+    Returns:
+        dict: 'epoch' and 'data_version' of the snapshot, 'contracts', 'rendered' and 'skipped' counts
+    """
+    cache = current_app.extensions['report_cache']
+    with span('report_snapshot'):
+        stamp, rows = load_snapshot()
+
+    pending = [params for params in standard_report_params(renderer)
+               if force or cache.get(params, stamp) is None]
+    summary = {'epoch': stamp.epoch, 'data_version': stamp.version, 'contracts': len(rows), 'rendered': 0,
+               'skipped': len(STANDARD_REPORTS) - len(pending)}
+    if not pending:
+        return summary
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+    temporaries = [cache.temporary_path() for _ in pending]
+    try:
+        with span('report_prerender'):
+            if workers == 1:
+                _init_worker(rows)
+                for params, temporary in zip(pending, temporaries):
+                    _render(params, temporary)
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(rows,)) as executor:
+                    for future in [executor.submit(_render, params, temporary)
+                                   for params, temporary in zip(pending, temporaries)]:
+                        future.result()
+        for params, temporary in zip(pending, temporaries):
+            cache.publish(params, stamp, temporary)
+    finally:
+        for temporary in temporaries:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    cache.evict(current=stamp)
+    summary['rendered'] = len(pending)
+    logger.info(f"Pre-rendered {len(pending)} reports for data version {stamp.version} "
+                f"from {len(rows)} contracts with {workers} workers")
+    return summary
+
+def watch_reports(interval: float = 30, **options) -> None:
+    """
+    Pre-render the standard reports now and again after every contract change.
+
+    Polls the data stamp every `interval` seconds until interrupted; `options`
+    are passed to prerender_reports. Must run inside an app context.
+    """
+    from data_version import get_data_stamp
+    from models import db
+
+    rendered = None
+    while True:
+        stamp = get_data_stamp()
+        db.session.remove()  # don't hold a read transaction open between polls
+        if stamp != rendered:
+            try:
+                summary = prerender_reports(**options)
+                rendered = DataStamp(summary['epoch'], summary['data_version'])
+            except Exception as e:
+                logger.error(f"Pre-rendering reports failed: {str(e)}")
+        time.sleep(interval)
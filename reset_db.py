@@ -1,6 +1,8 @@
-from app import app, db
+from app import create_app, db
+from migrations import upgrade
 
+app = create_app()
 with app.app_context():
     db.drop_all()
-    db.create_all()
+    upgrade(db.engine)
     print("Database has been reset successfully!")
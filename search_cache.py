@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Dict, Hashable
+
+from contract_export import EXPORT_FIELDS
+from data_version import get_data_stamp
+from metrics import REGISTRY
+from money import money_json
+
+REGISTRY.counter('search_cache_requests_total', 'Contract search cache lookups by result (hit or miss)')
+REGISTRY.counter('search_cache_evictions_total', 'Contract search results evicted to stay within SEARCH_CACHE_SIZE')
+REGISTRY.counter('search_cache_invalidations_total', 'Contract search cache flushes after a contract change')
+
+class ContractRow(namedtuple('ContractRow', EXPORT_FIELDS)):
+    """Plain, session-independent copy of a contract, with the attributes templates use."""
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = self._asdict()
+        for field in ('start_date', 'expiration_date'):
+            if record[field] is not None:
+                record[field] = record[field].isoformat()
+        record['value'] = money_json(record['value'])
+        return record
+
+class SearchCache:
+    """
+    Bounded LRU cache of contract search results for this process.
+
+    Entries are tied to the data stamp they were read at: the first lookup after
+    any contract change, or after the database is recreated, empties the cache, so results are never stale. Entries also
+    expire after SEARCH_CACHE_TTL seconds, and the least recently used ones are
+    dropped beyond SEARCH_CACHE_SIZE entries (0 disables the cache). Each worker
+    process keeps its own cache.
+    """
+
+    def __init__(self, app=None):
+        self.max_entries = 0
+        self.ttl = 0
+        self.entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()  # key -> (stored at, value)
+        self.version = None
+        self.lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault('SEARCH_CACHE_SIZE', 256)
+        app.config.setdefault('SEARCH_CACHE_TTL', 300)
+        self.max_entries = app.config['SEARCH_CACHE_SIZE']
+        self.ttl = app.config['SEARCH_CACHE_TTL']
+        app.extensions['search_cache'] = self
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for key, calling load() to produce it on a miss.
+
+        Results must not hold ORM instances or anything else bound to a session.
+        Exceptions from load() propagate and nothing is cached.
+        """
+        if self.max_entries <= 0:
+            return load()
+
+        version = get_data_stamp()
+        now = time.monotonic()
+        with self.lock:
+            if version != self.version:
+                if self.entries:
+                    REGISTRY.inc('search_cache_invalidations_total')
+                self.entries.clear()
+                self.version = version
+            entry = self.entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self.entries.move_to_end(key)
+                REGISTRY.inc('search_cache_requests_total', result='hit')
+                return entry[1]
+            REGISTRY.inc('search_cache_requests_total', result='miss')
+
+        value = load()
+        with self.lock:
+            if self.version == version:
+                self.entries[key] = (now, value)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+                    REGISTRY.inc('search_cache_evictions_total')
+        return value
@@ -0,0 +1,158 @@
+import logging
+import re
+import weakref
+from typing import Any, List, Optional
+
+from sqlalchemy import Column, Float, Integer, MetaData, Table, Text, event, select, text
+from sqlalchemy.exc import OperationalError
+
+from models import db, Contract
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'contract_fts'
+FTS_COLUMNS = ['contract_number', 'contract_name', 'notes']
+
+# Kept out of db.metadata so create_all()/drop_all() never treat it as a regular table
+contract_fts = Table(
+    FTS_TABLE, MetaData(),
+    Column('rowid', Integer),
+    Column(FTS_TABLE, Text),  # hidden column used as the left operand of MATCH
+    Column('contract_number', Text),
+    Column('contract_name', Text),
+    Column('notes', Text),
+    Column('rank', Float),
+)
+
+_columns = ', '.join(FTS_COLUMNS)
+_new_values = ', '.join(f'new.{name}' for name in FTS_COLUMNS)
+_old_values = ', '.join(f'old.{name}' for name in FTS_COLUMNS)
+
+FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{_columns}, content='contract', content_rowid='id', tokenize='unicode61')",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON contract BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON contract BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_columns} ON contract BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+]
+
+# Engine -> whether the FTS table exists, so availability is only looked up once
+_availability = weakref.WeakKeyDictionary()
+
+def create_fts_index(connection) -> bool:
+    """
+    Create the FTS5 index and its sync triggers, populating it from existing contracts.
+
+    Args:
+        connection: SQLAlchemy connection to the contracts database
+
+    Returns:
+        bool: True if the index exists afterwards, False if the database lacks FTS5
+    """
+    _availability.pop(connection.engine, None)
+    if connection.dialect.name != 'sqlite':
+        return False
+
+    try:
+        existed = _fts_table_exists(connection)
+        for statement in FTS_DDL:
+            connection.execute(text(statement))
+        if not existed:
+            connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            logger.info("Created full-text index for contracts")
+        return True
+    except OperationalError as e:
+        logger.warning(f"Full-text search unavailable, falling back to LIKE search: {str(e)}")
+        return False
+
+def drop_fts_index(connection) -> None:
+    """Drop the FTS5 index and its triggers if present."""
+    _availability.pop(connection.engine, None)
+    if connection.dialect.name != 'sqlite':
+        return
+    for suffix in ('ai', 'ad', 'au'):
+        connection.execute(text(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}'))
+    connection.execute(text(f'DROP TABLE IF EXISTS {FTS_TABLE}'))
+
+def _fts_table_exists(connection) -> bool:
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': FTS_TABLE}
+    ).first() is not None
+
+def fts_available() -> bool:
+    """Whether the current database has a usable full-text index."""
+    engine = db.engine
+    if engine not in _availability:
+        if engine.dialect.name != 'sqlite':
+            _availability[engine] = False
+        else:
+            with engine.connect() as connection:
+                _availability[engine] = _fts_table_exists(connection)
+    return _availability[engine]
+
+def fts_match_expression(search_term: str, search_field: Optional[str] = None) -> Optional[str]:
+    """
+    Translate free text into an FTS5 query matching every word as a prefix.
+
+    Args:
+        search_term (str): Text typed by the user
+        search_field (str): Restrict matching to this indexed column
+
+    Returns:
+        Optional[str]: The MATCH expression, or None if the term contains no words
+    """
+    words = re.findall(r'\w+', search_term)
+    if not words:
+        return None
+    expression = ' AND '.join('"{}"*'.format(word) for word in words)
+    if search_field in FTS_COLUMNS:
+        return f'{search_field} : ({expression})'
+    return expression
+
+def fts_search_filters(search_field: str, search_term: str) -> Optional[List[Any]]:
+    """
+    Build full-text criteria for a contract search.
+
+    Returns:
+        Optional[List[Any]]: Criteria for a Contract query, or None when full-text
+        search cannot serve this search and the LIKE path should be used instead
+    """
+    if search_field not in FTS_COLUMNS or not fts_available():
+        return None
+    expression = fts_match_expression(search_term, search_field)
+    if expression is None:
+        return None
+    matches = select(contract_fts.c.rowid).where(contract_fts.c[FTS_TABLE].match(expression))
+    return [Contract.id.in_(matches)]
+
+def ranked_fts_matches(search_field: str, search_term: str):
+    """
+    Subquery of (rowid, rank) for contracts matching the search, best matches first.
+
+    Returns:
+        The subquery, or None when full-text search cannot serve this search
+    """
+    if search_field not in FTS_COLUMNS or not fts_available():
+        return None
+    expression = fts_match_expression(search_term, search_field)
+    if expression is None:
+        return None
+    return select(contract_fts.c.rowid, contract_fts.c.rank).where(
+        contract_fts.c[FTS_TABLE].match(expression)
+    ).subquery()
+
+@event.listens_for(Contract.__table__, 'after_create')
+def _create_fts_after_contract(target, connection, **kw):
+    create_fts_index(connection)
+
+@event.listens_for(Contract.__table__, 'before_drop')
+def _drop_fts_before_contract(target, connection, **kw):
+    drop_fts_index(connection)
@@ -0,0 +1,105 @@
+import os
+from typing import Any, Dict
+
+from flask import current_app
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+
+from models import db
+
+DEFAULT_DATABASE_URL = 'sqlite:///contracts.db'
+
+def is_memory_database(url) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+class Storage:
+    """
+    Database configuration for running under several worker processes.
+
+    Takes the database URL from DATABASE_URL, initialises Flask-SQLAlchemy with a
+    connection pool sized by SQLITE_POOL_SIZE / SQLITE_MAX_OVERFLOW, and sets the
+    SQLite pragmas on every new connection. WAL lets readers work while an import
+    or edit is writing, and busy_timeout makes writers wait for each other instead
+    of failing with "database is locked".
+
+    Long reads such as exports go through a separate read-only engine, so they never
+    hold a connection from the write pool. An in-memory database has only one
+    connection, shared by both.
+    """
+
+    def __init__(self, app=None):
+        self.read_engines: Dict[Any, Engine] = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault('SQLALCHEMY_DATABASE_URI', os.environ.get('DATABASE_URL', DEFAULT_DATABASE_URL))
+        app.config.setdefault('SQLITE_JOURNAL_MODE', 'WAL')
+        app.config.setdefault('SQLITE_SYNCHRONOUS', 'NORMAL')  # durable at checkpoints, safe with WAL
+        app.config.setdefault('SQLITE_BUSY_TIMEOUT_MS', 5000)
+        app.config.setdefault('SQLITE_CACHE_SIZE_KB', 64 * 1024)
+        app.config.setdefault('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)
+        app.config.setdefault('SQLITE_POOL_SIZE', 5)
+        app.config.setdefault('SQLITE_MAX_OVERFLOW', 10)
+
+        url = app.config['SQLALCHEMY_DATABASE_URI']
+        options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+        if make_url(url).get_backend_name() == 'sqlite' and not is_memory_database(url):
+            options.setdefault('pool_size', app.config['SQLITE_POOL_SIZE'])
+            options.setdefault('max_overflow', app.config['SQLITE_MAX_OVERFLOW'])
+            connect_args = options.setdefault('connect_args', {})
+            connect_args.setdefault('timeout', app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000)
+            connect_args.setdefault('check_same_thread', False)
+
+        db.init_app(app)
+        with app.app_context():
+            engine = db.engine
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', self._pragma_listener(app.config, read_only=False))
+        app.extensions['storage'] = self
+
+    def read_engine(self, app=None) -> Engine:
+        """Engine for read-only work, created on first use."""
+        app = app or current_app._get_current_object()
+        if app not in self.read_engines:
+            engine = db.engine
+            if engine.dialect.name == 'sqlite' and not is_memory_database(engine.url):
+                engine = create_engine(
+                    engine.url,
+                    pool_size=app.config['SQLITE_POOL_SIZE'],
+                    max_overflow=app.config['SQLITE_MAX_OVERFLOW'],
+                    connect_args={'timeout': app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000,
+                                  'check_same_thread': False},
+                )
+                event.listen(engine, 'connect', self._pragma_listener(app.config, read_only=True))
+            self.read_engines[app] = engine
+        return self.read_engines[app]
+
+    @staticmethod
+    def _pragma_listener(config, read_only: bool):
+        pragmas = [
+            f"busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+            f"synchronous = {config['SQLITE_SYNCHRONOUS']}",
+            f"cache_size = -{int(config['SQLITE_CACHE_SIZE_KB'])}",
+            f"mmap_size = {int(config['SQLITE_MMAP_SIZE'])}",
+            "temp_store = MEMORY",
+        ]
+        if not read_only:
+            # Persistent in the database file, but cheap to reassert
+            pragmas.insert(0, f"journal_mode = {config['SQLITE_JOURNAL_MODE']}")
+        else:
+            pragmas.append("query_only = ON")
+
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(f'PRAGMA {pragma}')
+            finally:
+                cursor.close()
+        return set_pragmas
+
+def read_engine() -> Engine:
+    """Read-only engine of the current app's database."""
+    return current_app.extensions['storage'].read_engine()
@@ -0,0 +1,32 @@
+import pytest
+
+from app import create_app, db
+from migrations import upgrade
+from models import Contract
+
+@pytest.fixture
+def app(tmp_path):
+    """Application on a freshly migrated database in a temporary directory."""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'contracts.db'}",
+        'REPORT_DIR': str(tmp_path / 'reports'),
+    })
+    with app.app_context():
+        upgrade(db.engine)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def add_contract(app):
+    """Insert an active contract with the given number."""
+    def add(number, value=100):
+        with app.app_context():
+            db.session.add(Contract(contract_number=number, contract_name=number, value=value, status='Active'))
+            db.session.commit()
+    return add
@@ -0,0 +1,32 @@
+from app import db
+from migrations import upgrade
+
+def test_changes_carry_epoch_and_cursor(client, add_contract):
+    add_contract('C-1')
+    add_contract('C-2')
+    body = client.get('/api/changes').get_json()
+    assert [change['contract_number'] for change in body['changes']] == ['C-1', 'C-2']
+    assert body['epoch']
+
+    add_contract('C-3')
+    body = client.get('/api/changes', query_string={'since': body['cursor'], 'epoch': body['epoch']}).get_json()
+    assert [change['contract_number'] for change in body['changes']] == ['C-3']
+
+def test_cursor_from_recreated_database_requires_resync(app, client, add_contract):
+    for number in ('OLD-1', 'OLD-2', 'OLD-3'):
+        add_contract(number)
+    old = client.get('/api/changes').get_json()
+    with app.app_context():
+        db.drop_all()
+        upgrade(db.engine)
+    for number in ('NEW-1', 'NEW-2', 'NEW-3', 'NEW-4'):
+        add_contract(number)
+
+    response = client.get('/api/changes', query_string={'since': old['cursor'], 'epoch': old['epoch']})
+    assert response.status_code == 410
+    assert response.get_json()['reset'] is True
+
+def test_cursor_beyond_the_log_requires_resync(client, add_contract):
+    add_contract('C-1')
+    response = client.get('/api/changes', query_string={'since': 100})
+    assert response.status_code == 410
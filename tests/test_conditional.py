@@ -0,0 +1,25 @@
+from app import db
+from migrations import upgrade
+
+def test_unchanged_page_answers_304(client):
+    etag = client.get('/').headers['ETag']
+    assert client.get('/', headers={'If-None-Match': etag}).status_code == 304
+
+def test_contract_change_invalidates_etag(client, add_contract):
+    etag = client.get('/').headers['ETag']
+    add_contract('C-1')
+    assert client.get('/', headers={'If-None-Match': etag}).status_code == 200
+
+def test_if_modified_since_alone_is_ignored(client):
+    response = client.get('/', headers={'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'})
+    assert response.status_code == 200
+    assert 'Last-Modified' not in response.headers
+
+def test_recreated_database_gets_new_etags(app, client, add_contract):
+    add_contract('OLD-1')
+    etag = client.get('/').headers['ETag']
+    with app.app_context():
+        db.drop_all()
+        upgrade(db.engine)
+    add_contract('NEW-1')
+    assert client.get('/', headers={'If-None-Match': etag}).status_code == 200
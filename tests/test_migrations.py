@@ -0,0 +1,10 @@
+from app import VALID_SORT_FIELDS, db
+from migrations import check_query_plans, get_version, latest_version
+
+def test_upgrade_reaches_current_version(app):
+    with app.app_context(), db.engine.connect() as connection:
+        assert get_version(connection) == latest_version()
+
+def test_listing_queries_use_an_index(app):
+    with app.app_context(), db.engine.connect() as connection:
+        assert check_query_plans(connection, VALID_SORT_FIELDS) == []
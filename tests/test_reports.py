@@ -0,0 +1,21 @@
+from app import db
+from data_version import get_data_stamp
+from migrations import upgrade
+from report_jobs import normalize_report_params
+
+def test_recreated_database_does_not_reuse_cached_reports(app, add_contract):
+    cache = app.extensions['report_cache']
+    params = normalize_report_params(renderer='canvas')
+    with app.app_context():
+        add_contract('OLD-1')
+        old = get_data_stamp()
+        cache.put(params, old, lambda path: open(path, 'wb').close())
+
+        db.drop_all()
+        upgrade(db.engine)
+        add_contract('NEW-1')
+        new = get_data_stamp()
+
+    assert new.version == old.version
+    assert new.epoch != old.epoch
+    assert cache.get(params, new) is None
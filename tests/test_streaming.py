@@ -0,0 +1,23 @@
+def add_contract_form(client, number):
+    return client.post('/add_contract', data={'contract_number': number, 'contract_name': f'Contract {number}',
+                                              'value': '1000', 'status': 'Active'})
+
+def test_show_all_streams_every_contract(client, add_contract):
+    for n in range(3):
+        add_contract(f'C-{n}')
+    response = client.get('/', query_string={'all': 1})
+    assert response.is_streamed
+    html = response.get_data(as_text=True)
+    assert all(f'C-{n}' in html for n in range(3))
+
+def test_streamed_page_consumes_flashed_messages(client):
+    add_contract_form(client, 'C-1')
+    streamed = client.get('/', query_string={'all': 1})
+    assert 'Contract added successfully!' in streamed.get_data(as_text=True)
+    assert 'Contract added successfully!' not in client.get('/').get_data(as_text=True)
+
+def test_streamed_search_consumes_flashed_messages(client):
+    add_contract_form(client, 'C-1')
+    streamed = client.get('/search', query_string={'all': 1, 'field': 'contract_name', 'query': 'Contract'})
+    assert 'Contract added successfully!' in streamed.get_data(as_text=True)
+    assert 'Contract added successfully!' not in client.get('/').get_data(as_text=True)